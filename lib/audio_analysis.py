@@ -13,14 +13,38 @@ Usage:
     # Batch similarity (flag same-sounding tracks)
     sim_matrix, flags = batch_similarity(["track1.m4a", "track2.m4a", ...])
 
+    # Library similarity (flag tracks that sound like anything generated before)
+    flags = library_similarity(["track1.m4a", "track2.m4a", ...])
+
     # Full critique (all checks combined)
     critique = full_critique("output/track.m4a", tags="dubstep, heavy bass, ...")
+
+    # Decode once, run several analyses on the same buffer
+    ctx = AnalysisContext("output/track.m4a")
+    critique = full_critique(ctx, tags="dubstep, heavy bass, ...")
+    embedding = extract_embedding(ctx)
+    ctx.flush_cache()   # write the new results to the feature cache once
+
+Results are cached on disk under .refrakt/caches/features/, keyed by the file's
+content hash and FEATURE_CACHE_VERSION. Use AnalysisContext(path, use_cache=False)
+to bypass the cache.
 """
 
+import functools
+import sys
+from functools import cached_property
+
 import librosa
 import numpy as np
 from pathlib import Path
 
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from disk_cache import DiskCache, file_sha256
+
 # Essentia is optional — used for enhanced fade detection and dynamic complexity
 try:
     import essentia.standard as es
@@ -28,21 +52,163 @@ try:
 except ImportError:
     HAS_ESSENTIA = False
 
+SAMPLE_RATE = 22050
+HOP_LENGTH = 512
+N_FFT = 2048
+
+# Bump whenever analysis parameters or algorithms change — invalidates cached features
+FEATURE_CACHE_VERSION = 2
+FEATURE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+_feature_cache = DiskCache("features", max_bytes=FEATURE_CACHE_MAX_BYTES)
+
+
+# --- Shared Decode Context ---
+
+class AnalysisContext:
+    """Decoded audio plus lazily computed shared representations for one file.
+
+    Every analysis function accepts either a path or an AnalysisContext. Passing
+    the same context to several of them decodes/resamples the file once and
+    computes the STFT, mel spectrogram, MFCCs, RMS and CQT at most once each.
+
+    With use_cache=True, analysis results are read from and written to the
+    on-disk feature cache, so an unchanged file is never decoded at all. New
+    results are collected in memory; whoever created the context calls
+    flush_cache() once its analyses are done.
+    """
+
+    def __init__(self, audio_path, use_cache=True):
+        self.path = str(audio_path)
+        self.use_cache = use_cache
+        self.cache_dirty = False
+
+    @cached_property
+    def y(self):
+        y, _ = librosa.load(self.path, sr=SAMPLE_RATE)
+        return y
+
+    @property
+    def sr(self):
+        return SAMPLE_RATE
+
+    @cached_property
+    def duration(self):
+        return float(librosa.get_duration(y=self.y, sr=self.sr))
+
+    @cached_property
+    def magnitude(self):
+        """|STFT| (n_fft=2048, hop=512) — librosa's default spectral frontend."""
+        return np.abs(librosa.stft(self.y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+    @cached_property
+    def mel_db(self):
+        mel = librosa.feature.melspectrogram(S=self.magnitude ** 2, sr=self.sr)
+        return librosa.power_to_db(mel)
+
+    @cached_property
+    def mfcc(self):
+        return librosa.feature.mfcc(S=self.mel_db, n_mfcc=20)
+
+    @cached_property
+    def rms(self):
+        return librosa.feature.rms(y=self.y, hop_length=HOP_LENGTH)[0]
+
+    @cached_property
+    def tuning(self):
+        """Tuning deviation in fractions of a bin, estimated as chroma_cqt(y=...) does."""
+        return float(librosa.estimate_tuning(y=self.y, sr=self.sr, bins_per_octave=36))
+
+    @cached_property
+    def cqt(self):
+        """|CQT| matching chroma_cqt/chroma_cens(y=...) (7 octaves, 36 bins/oct, estimated tuning)."""
+        return np.abs(librosa.cqt(self.y, sr=self.sr, hop_length=HOP_LENGTH,
+                                  n_bins=7 * 36, bins_per_octave=36, tuning=self.tuning))
+
+    @cached_property
+    def essentia_audio(self):
+        """44.1kHz mono buffer from Essentia's MonoLoader (shared by fade + dynamics)."""
+        return _essentia_load(self.path)
+
+    @cached_property
+    def cache_key(self):
+        return f"{file_sha256(self.path)}-v{FEATURE_CACHE_VERSION}"
+
+    @cached_property
+    def cache_entry(self):
+        return _feature_cache.get(self.cache_key) or {}
+
+    def cache_store(self, name, value):
+        self.cache_entry[name] = value
+        self.cache_dirty = True
+
+    def flush_cache(self, prune=True):
+        """Write the cache entry if anything new was stored. Batches pass prune=False
+        and call prune_feature_cache() once at the end."""
+        if not self.cache_dirty:
+            return
+        _feature_cache.put(self.cache_key, self.cache_entry, prune=prune)
+        self.cache_dirty = False
+
+
+def prune_feature_cache():
+    """Evict least recently used feature cache entries past FEATURE_CACHE_MAX_BYTES."""
+    return _feature_cache.prune()
+
+
+def _as_context(audio):
+    """Accept a path or an AnalysisContext, return an AnalysisContext."""
+    if isinstance(audio, AnalysisContext):
+        return audio
+    return AnalysisContext(audio)
+
+
+def _feature_cached(name):
+    """Cache a single-file analysis result in the context's feature cache entry.
+
+    Only calls with default parameters are cached. None and error results are
+    not stored (Essentia missing or a transient load failure).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(audio_path, *args, **kwargs):
+            ctx = _as_context(audio_path)
+            if args or kwargs or not ctx.use_cache:
+                return fn(ctx, *args, **kwargs)
+
+            cached = ctx.cache_entry.get(name)
+            if cached is not None:
+                if isinstance(cached, dict) and "__ndarray__" in cached:
+                    return np.asarray(cached["__ndarray__"])
+                return cached
+
+            value = fn(ctx)
+            if value is None or (isinstance(value, dict) and "error" in value):
+                return value
+            stored = {"__ndarray__": value.tolist()} if isinstance(value, np.ndarray) else value
+            ctx.cache_store(name, stored)
+            if ctx is not audio_path:
+                ctx.flush_cache()
+            return value
+        return wrapper
+    return decorator
+
 
 # --- Feature Extraction ---
 
+@_feature_cached("embedding")
 def extract_embedding(audio_path, n_mfcc=20):
     """Extract a 59-dimensional feature vector for similarity comparison."""
-    y, sr = librosa.load(str(audio_path), sr=22050)
+    ctx = _as_context(audio_path)
 
-    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+    mfccs = ctx.mfcc if n_mfcc == 20 else librosa.feature.mfcc(S=ctx.mel_db, n_mfcc=n_mfcc)
     mfcc_mean = np.mean(mfccs, axis=1)
     mfcc_std = np.std(mfccs, axis=1)
 
-    chroma = librosa.feature.chroma_cens(y=y, sr=sr)
+    chroma = librosa.feature.chroma_cens(C=ctx.cqt, sr=ctx.sr)
     chroma_mean = np.mean(chroma, axis=1)
 
-    contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+    contrast = librosa.feature.spectral_contrast(S=ctx.magnitude, sr=ctx.sr)
     contrast_mean = np.mean(contrast, axis=1)
 
     return np.concatenate([mfcc_mean, mfcc_std, chroma_mean, contrast_mean])
@@ -50,6 +216,7 @@ def extract_embedding(audio_path, n_mfcc=20):
 
 # --- Truncation Detection ---
 
+@_feature_cached("truncation")
 def detect_truncation(audio_path):
     """Detect if a track was truncated by Suno's 8-minute limit.
 
@@ -59,30 +226,46 @@ def detect_truncation(audio_path):
         reason: str
         duration_seconds: float
     """
-    y, sr = librosa.load(str(audio_path), sr=22050)
-    duration = librosa.get_duration(y=y, sr=sr)
+    ctx = _as_context(audio_path)
+    duration = ctx.duration
+
+    # Checks on duration alone don't need the RMS envelope
+    result = _truncation_by_duration(duration)
+    if "truncated" in result:
+        return result
+
+    # Body energy: middle 80% of the track
+    rms = ctx.rms
+    body_start = int(len(rms) * 0.1)
+    body_end = int(len(rms) * 0.9)
+    body_rms = np.mean(rms[body_start:body_end]) if body_end > body_start else np.mean(rms)
+
+    return _truncation_by_ending(result, duration, rms, body_rms)
+
 
+def _truncation_by_duration(duration):
+    """Check 1 of detect_truncation: duration threshold. Sets 'truncated' only when conclusive."""
     result = {
         "duration_seconds": float(duration),
         "duration_display": f"{int(duration // 60)}:{int(duration % 60):02d}",
     }
 
-    # Check 1: Duration threshold
     if duration >= 475:  # 7:55+
         result["truncated"] = True
         result["confidence"] = 0.95
         result["reason"] = "duration_exceeds_limit"
-        return result
     elif duration >= 470:  # 7:50+
         result["duration_warning"] = True
+    return result
 
-    # Check 2: Abrupt ending via RMS energy
-    rms = librosa.feature.rms(y=y, hop_length=512)[0]
-    times = librosa.frames_to_time(range(len(rms)), sr=sr, hop_length=512)
 
-    body_start = int(len(rms) * 0.1)
-    body_end = int(len(rms) * 0.9)
-    body_rms = np.mean(rms[body_start:body_end]) if body_end > body_start else np.mean(rms)
+def _truncation_by_ending(result, duration, rms, body_rms, rms_start=0.0):
+    """Check 2 of detect_truncation: abrupt ending via RMS energy.
+
+    rms is the frame envelope from rms_start seconds to the end of the track
+    (the whole track, or just the tail window for detect_truncation_fast).
+    """
+    times = rms_start + librosa.frames_to_time(range(len(rms)), sr=SAMPLE_RATE, hop_length=HOP_LENGTH)
 
     last_2s_idx = np.searchsorted(times, duration - 2.0)
     last_500ms_idx = np.searchsorted(times, duration - 0.5)
@@ -106,7 +289,7 @@ def detect_truncation(audio_path):
     energy_ratio = last_500ms_rms / (pre_end_rms + 1e-8)
     final_frame_energy = float(rms[-1]) / (body_rms + 1e-8)
 
-    truncated = energy_ratio > 0.7 and final_frame_energy > 0.3
+    truncated = bool(energy_ratio > 0.7 and final_frame_energy > 0.3)
     result["truncated"] = truncated
     result["confidence"] = float(min(1.0, energy_ratio * final_frame_energy * 2))
     result["reason"] = "abrupt_cutoff" if truncated else "natural_ending"
@@ -116,37 +299,125 @@ def detect_truncation(audio_path):
     return result
 
 
+# --- Fast Truncation Check (tail only) ---
+
+TAIL_SECONDS = 3.0        # decoded at the end of the file (covers the 2s ending window)
+BODY_SAMPLE_COUNT = 6     # short windows spread over 10%-90% to estimate body energy
+BODY_SAMPLE_SECONDS = 1.0
+FAST_MIN_DURATION = 20.0  # shorter files are cheap enough to decode fully
+
+
+def container_duration(audio_path):
+    """Duration in seconds from the container header (mutagen, then ffprobe). None if unknown."""
+    try:
+        import mutagen
+        info = mutagen.File(str(audio_path))
+        if info is not None and info.info and info.info.length:
+            return float(info.info.length)
+    except Exception:
+        pass
+
+    import shutil
+    import subprocess
+    if not shutil.which("ffprobe"):
+        return None
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", str(audio_path)],
+            capture_output=True, text=True, timeout=15,
+        )
+        return float(out.stdout.strip())
+    except (subprocess.TimeoutExpired, OSError, ValueError):
+        return None
+
+
+def decode_window(audio_path, start, seconds=None):
+    """Decode [start, start+seconds) as mono float32 at SAMPLE_RATE via an ffmpeg seek.
+
+    Only the requested window (from the nearest packet) is decoded — not the
+    whole file. seconds=None reads to the end.
+    """
+    import subprocess
+    cmd = ["ffmpeg", "-v", "error", "-ss", f"{max(0.0, start):.3f}", "-i", str(audio_path)]
+    if seconds is not None:
+        cmd += ["-t", f"{seconds:.3f}"]
+    cmd += ["-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"]
+    result = subprocess.run(cmd, capture_output=True, timeout=30)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr[:200]!r}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def detect_truncation_fast(audio_path):
+    """Near-constant-time variant of detect_truncation for use right after download.
+
+    Takes the duration from the container, decodes only the last TAIL_SECONDS,
+    and estimates body energy from a few short sampled windows. Falls back to
+    the full decode for short files or when ffmpeg/duration are unavailable.
+    Returns the same dict shape as detect_truncation.
+    """
+    import shutil
+    duration = container_duration(audio_path)
+    if duration is None or duration < FAST_MIN_DURATION or not shutil.which("ffmpeg"):
+        return detect_truncation(audio_path)
+
+    result = _truncation_by_duration(duration)
+    if "truncated" in result:
+        return result
+
+    tail_start = max(0.0, duration - TAIL_SECONDS)
+    tail = decode_window(audio_path, tail_start)
+    if len(tail) == 0:
+        return detect_truncation(audio_path)
+    # Decoded tail length is authoritative for where the audio actually ends
+    tail_end = tail_start + len(tail) / SAMPLE_RATE
+    tail_rms = librosa.feature.rms(y=tail, hop_length=HOP_LENGTH)[0]
+
+    body_rms_samples = []
+    for frac in np.linspace(0.1, 0.9, BODY_SAMPLE_COUNT):
+        window = decode_window(audio_path, duration * frac, BODY_SAMPLE_SECONDS)
+        if len(window):
+            body_rms_samples.append(librosa.feature.rms(y=window, hop_length=HOP_LENGTH)[0])
+    body_rms = np.mean(np.concatenate(body_rms_samples)) if body_rms_samples else np.mean(tail_rms)
+
+    result["fast_path"] = True
+    return _truncation_by_ending(result, tail_end, tail_rms, body_rms, rms_start=tail_start)
+
+
 # --- Timbral Variety (single track) ---
 
+@_feature_cached("variety")
 def measure_variety(audio_path):
     """Measure timbral variety within a single track.
 
     Low variety = one synth loop for 3 minutes (generic).
     High variety = distinct sections, layering, dynamic changes.
     """
-    y, sr = librosa.load(str(audio_path), sr=22050)
-    duration = librosa.get_duration(y=y, sr=sr)
+    ctx = _as_context(audio_path)
+    sr = ctx.sr
+    duration = ctx.duration
 
     # MFCC temporal variation
-    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=20)
+    mfccs = ctx.mfcc
     mfcc_temporal_std = np.std(mfccs, axis=1)
     variety_score = float(np.mean(mfcc_temporal_std))
 
     # Spectral centroid coefficient of variation
-    centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
+    centroid = librosa.feature.spectral_centroid(S=ctx.magnitude, sr=sr)
     centroid_cv = float(np.std(centroid) / (np.mean(centroid) + 1e-8))
 
     # Onset density (events per second)
-    onsets = librosa.onset.onset_detect(y=y, sr=sr, units="time")
+    onset_env = librosa.onset.onset_strength(S=ctx.mel_db, sr=sr)
+    onsets = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr, units="time")
     onset_density = len(onsets) / duration if duration > 0 else 0
 
     # Dynamic range (dB difference between loud and quiet sections)
-    rms = librosa.feature.rms(y=y, hop_length=512)[0]
-    rms_db = librosa.amplitude_to_db(rms + 1e-8)
+    rms_db = librosa.amplitude_to_db(ctx.rms + 1e-8)
     dynamic_range = float(np.percentile(rms_db, 95) - np.percentile(rms_db, 5))
 
     # Spectral flatness (how "noisy" vs "tonal" — high = white noise, low = pure tones)
-    flatness = librosa.feature.spectral_flatness(y=y)
+    flatness = librosa.feature.spectral_flatness(S=ctx.magnitude)
     avg_flatness = float(np.mean(flatness))
 
     return {
@@ -161,14 +432,15 @@ def measure_variety(audio_path):
 
 # --- Structural Analysis ---
 
+@_feature_cached("structure")
 def analyze_structure(audio_path, n_segments=6):
     """Detect whether a track has actual sections or is one loop repeated.
 
     Returns avg_section_similarity (high = repetitive, low = varied).
     """
-    y, sr = librosa.load(str(audio_path), sr=22050)
+    ctx = _as_context(audio_path)
 
-    chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
+    chroma = librosa.feature.chroma_cqt(C=ctx.cqt, sr=ctx.sr)
 
     # Structural segmentation
     bounds = librosa.segment.agglomerative(chroma, k=min(n_segments, chroma.shape[1] - 1))
@@ -211,6 +483,7 @@ def _essentia_load(audio_path):
     return es.MonoLoader(filename=path, sampleRate=44100)()
 
 
+@_feature_cached("fade_detection")
 def detect_fade(audio_path):
     """Use Essentia's FadeDetection for proper fade-out detection.
 
@@ -221,7 +494,7 @@ def detect_fade(audio_path):
         return None
 
     try:
-        audio = _essentia_load(audio_path)
+        audio = _as_context(audio_path).essentia_audio
         fade = es.FadeDetection(minLength=1.5, cutoffHigh=0.85, cutoffLow=0.2)
         fade_in, fade_out = fade(audio)
 
@@ -239,6 +512,7 @@ def detect_fade(audio_path):
         return {"error": str(e)}
 
 
+@_feature_cached("dynamic_complexity")
 def measure_dynamic_complexity(audio_path):
     """Use Essentia's DynamicComplexity for loudness fluctuation analysis.
 
@@ -249,7 +523,7 @@ def measure_dynamic_complexity(audio_path):
         return None
 
     try:
-        audio = _essentia_load(audio_path)
+        audio = _as_context(audio_path).essentia_audio
         dc = es.DynamicComplexity()
         complexity, loudness = dc(audio)
 
@@ -264,64 +538,116 @@ def measure_dynamic_complexity(audio_path):
 
 # --- Batch Similarity ---
 
-def batch_similarity(audio_paths, threshold=0.93):
+def batch_similarity(audio_paths, threshold=0.93, embeddings=None):
     """Compute pairwise similarity for a batch. Flag pairs above threshold.
 
+    audio_paths may contain AnalysisContext objects (reuses their decoded audio).
+    Pass precomputed embeddings (same order as audio_paths) to skip extraction.
+
     Returns (similarity_matrix, flagged_pairs).
     """
     from sklearn.metrics.pairwise import cosine_similarity
 
-    embeddings = []
-    for p in audio_paths:
-        try:
-            emb = extract_embedding(p)
-            embeddings.append(emb)
-        except Exception as e:
-            print(f"  Warning: could not process {p}: {e}")
-            embeddings.append(np.zeros(59))
+    contexts = [_as_context(p) for p in audio_paths]
+    if embeddings is None:
+        embeddings = []
+        for ctx in contexts:
+            try:
+                emb = extract_embedding(ctx)
+                embeddings.append(emb)
+            except Exception as e:
+                print(f"  Warning: could not process {ctx.path}: {e}")
+                embeddings.append(np.zeros(59))
+            ctx.flush_cache(prune=False)
+        prune_feature_cache()
+    audio_paths = [ctx.path for ctx in contexts]
 
     matrix = cosine_similarity(embeddings)
-    n = len(audio_paths)
 
-    flagged = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            if matrix[i][j] > threshold:
-                flagged.append({
-                    "track_a": str(audio_paths[i]),
-                    "track_b": str(audio_paths[j]),
-                    "similarity": float(matrix[i][j]),
-                })
+    # Upper triangle only (each pair once, no self-pairs); argwhere keeps (i, j) row-major order
+    pairs = np.argwhere(np.triu(matrix > threshold, k=1))
+    flagged = [{
+        "track_a": str(audio_paths[i]),
+        "track_b": str(audio_paths[j]),
+        "similarity": float(matrix[i, j]),
+    } for i, j in pairs]
 
     return matrix, flagged
 
 
+def library_similarity(audio_paths, threshold=0.93, embeddings=None, index=None, add=True):
+    """Check clips against every clip ever indexed (see embedding_index.EmbeddingIndex).
+
+    Clips in this batch are never matched against each other or themselves —
+    batch_similarity covers that. Afterwards the batch is added to the index
+    unless add=False.
+
+    Returns flagged pairs in batch_similarity's format (track_a = new clip,
+    track_b = library clip).
+    """
+    from embedding_index import EmbeddingIndex
+
+    contexts = [_as_context(p) for p in audio_paths]
+    paths = [ctx.path for ctx in contexts]
+    if embeddings is None:
+        embeddings = []
+        for ctx in contexts:
+            embeddings.append(extract_embedding(ctx))
+            ctx.flush_cache(prune=False)
+        prune_feature_cache()
+    if index is None:
+        index = EmbeddingIndex()
+
+    keys = [file_sha256(p) for p in paths]
+    matches = index.query(embeddings, threshold=threshold, exclude_keys=keys)
+
+    flagged = []
+    for path, clip_matches in zip(paths, matches):
+        for m in clip_matches:
+            flagged.append({
+                "track_a": path,
+                "track_b": m["path"],
+                "similarity": m["similarity"],
+            })
+
+    if add:
+        index.add_many(keys, paths, embeddings)
+
+    return flagged
+
+
 # --- Combined Analysis ---
 
 def analyze_track(audio_path):
-    """Run all analyses on a single track. Returns combined report."""
-    path = str(audio_path)
+    """Run all analyses on a single track. Returns combined report.
 
-    truncation = detect_truncation(path)
-    variety = measure_variety(path)
-    structure = analyze_structure(path)
+    The file is decoded once; pass an AnalysisContext to share it further
+    (e.g. with extract_embedding).
+    """
+    ctx = _as_context(audio_path)
+
+    truncation = detect_truncation(ctx)
+    variety = measure_variety(ctx)
+    structure = analyze_structure(ctx)
 
     report = {
-        "file": Path(path).name,
+        "file": Path(ctx.path).name,
         "truncation": truncation,
         "variety": variety,
         "structure": structure,
     }
 
     # Essentia enhancements (optional — gracefully absent)
-    fade = detect_fade(path)
+    fade = detect_fade(ctx)
     if fade:
         report["fade_detection"] = fade
 
-    dynamics = measure_dynamic_complexity(path)
+    dynamics = measure_dynamic_complexity(ctx)
     if dynamics:
         report["dynamic_complexity"] = dynamics
 
+    if ctx is not audio_path:
+        ctx.flush_cache()
     return report
 
 
@@ -329,7 +655,7 @@ def full_critique(audio_path, tags="", is_instrumental=True, expected_duration=N
     """Generate a human-readable critique with pass/fail flags.
 
     Args:
-        audio_path: path to .m4a or .mp3 file
+        audio_path: path to .m4a or .mp3 file (or an AnalysisContext)
         tags: Suno style tags string (for context-aware checks)
         is_instrumental: True if no vocals expected
         expected_duration: optional target duration in seconds. If None, uses
@@ -337,7 +663,8 @@ def full_critique(audio_path, tags="", is_instrumental=True, expected_duration=N
 
     Returns dict with 'issues' list and 'verdict' (pass/warn/fail).
     """
-    report = analyze_track(audio_path)
+    ctx = _as_context(audio_path)
+    report = analyze_track(ctx)
     issues = []
 
     # Truncation (too long)
@@ -424,9 +751,30 @@ def full_critique(audio_path, tags="", is_instrumental=True, expected_duration=N
     else:
         verdict = "PASS"
 
+    if ctx is not audio_path:
+        ctx.flush_cache()
     return {
-        "file": Path(audio_path).name,
+        "file": Path(ctx.path).name,
         "verdict": verdict,
         "issues": issues,
         "metrics": report,
     }
+
+
+def critique_with_embedding(audio_path, tags="", is_instrumental=True, use_cache=True):
+    """Run full_critique and extract_embedding from a single decode.
+
+    Module-level so it can be shipped to a process pool (bin/eval-batch --workers).
+    Returns (critique, embedding); the embedding is zeros if extraction failed.
+    The feature cache entry is written once but not pruned; call
+    prune_feature_cache() after the batch.
+    """
+    ctx = AnalysisContext(audio_path, use_cache=use_cache)
+    critique = full_critique(ctx, tags=tags, is_instrumental=is_instrumental)
+    try:
+        embedding = extract_embedding(ctx)
+    except Exception as e:
+        print(f"  Warning: could not embed {audio_path}: {e}")
+        embedding = np.zeros(59)
+    ctx.flush_cache(prune=False)
+    return critique, embedding
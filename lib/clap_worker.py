@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+clap_worker.py — Long-lived local CLAP inference worker.
+
+Loads the LAION-CLAP model once and serves batched audio/text embeddings over
+localhost HTTP, so every bin/ command that scores tags reuses a warm model
+instead of paying the ~600MB checkpoint load. music_analysis.embed_audio /
+embed_text use it automatically when it is reachable at CLAP_WORKER_URL.
+
+Usage (via bin/clap-worker):
+    bin/clap-worker                       # serve on 127.0.0.1:8765
+    bin/clap-worker --port 9000           # then export CLAP_WORKER_URL=http://127.0.0.1:9000
+
+Endpoints:
+    GET  /health          {"ok": true}
+    POST /embed/audio     {"paths": [...]}   -> {"embeddings": [[...], ...]}
+    POST /embed/text      {"labels": [...]}  -> {"embeddings": [[...], ...]}
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from music_analysis import _get_clap_model, embed_audio_local, embed_text_local
+
+
+class ClapHandler(BaseHTTPRequestHandler):
+    """One request at a time (HTTPServer is single-threaded) — the model isn't shared across threads."""
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"ok": True})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            t0 = time.time()
+            if self.path == "/embed/audio":
+                items = payload.get("paths", [])
+                embeddings = embed_audio_local(items) if items else []
+            elif self.path == "/embed/text":
+                items = payload.get("labels", [])
+                embeddings = embed_text_local(items) if items else []
+            else:
+                self._send_json(404, {"error": "not found"})
+                return
+            print(f"  {self.path}: {len(items)} item(s) in {time.time() - t0:.2f}s", flush=True)
+            self._send_json(200, {"embeddings": [list(map(float, e)) for e in embeddings]})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        pass  # per-request timing is printed above instead
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve CLAP embeddings from a warm model over localhost")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    args = parser.parse_args()
+
+    print("Loading CLAP model...")
+    t0 = time.time()
+    _get_clap_model()
+    print(f"  Loaded in {time.time() - t0:.1f}s")
+
+    server = HTTPServer((args.host, args.port), ClapHandler)
+    print(f"CLAP worker listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+clip_store.py — Local SQLite mirror of the Suno clip feed.
+
+Keeps every clip the feed has ever returned in .refrakt/clips.db, indexed by
+full ID, 8-char prefix, title and creation time, plus the local path of the
+downloaded .m4a when there is one. sync() pages /api/feed/ newest-first and
+stops at the first page that reaches clips already stored in a final state,
+so a routine sync is one request instead of ten.
+
+Used by tag_tracks --all (metadata by prefix), suno submit / suno-generate
+(new clip IDs = what sync() inserted) and suno pick (candidate files by title).
+
+Usage:
+    from clip_store import ClipStore
+
+    store = ClipStore()
+    new_ids = store.sync(lambda page: get_feed(session, jwt, page=page))
+    clip = store.by_prefix("3aceca01")
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+DB_PATH = BASE_DIR / ".refrakt" / "clips.db"
+SYNC_MAX_PAGES = 10
+FINAL_STATUSES = ("complete", "error")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    id          TEXT PRIMARY KEY,
+    prefix      TEXT NOT NULL,
+    title       TEXT,
+    created_at  TEXT,
+    status      TEXT,
+    data        TEXT NOT NULL,
+    local_path  TEXT,
+    synced_at   REAL
+);
+CREATE INDEX IF NOT EXISTS clips_prefix ON clips(prefix);
+CREATE INDEX IF NOT EXISTS clips_title ON clips(title);
+CREATE INDEX IF NOT EXISTS clips_created ON clips(created_at);
+"""
+
+
+class ClipStore:
+    """SQLite-backed clip metadata store. Safe to share across threads and processes."""
+
+    def __init__(self, path: str | Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # --- Writes ---
+
+    def upsert_many(self, clips: list[dict]) -> list[str]:
+        """Insert or refresh clips from feed JSON. Returns the IDs that were new to the store."""
+        now = time.time()
+        new_ids = []
+        with self.lock, self._connect() as db:
+            for clip in clips:
+                clip_id = clip.get("id")
+                if not clip_id:
+                    continue
+                exists = db.execute("SELECT 1 FROM clips WHERE id = ?", (clip_id,)).fetchone()
+                if not exists:
+                    new_ids.append(clip_id)
+                db.execute(
+                    """INSERT INTO clips (id, prefix, title, created_at, status, data, synced_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(id) DO UPDATE SET
+                           title = excluded.title, created_at = excluded.created_at,
+                           status = excluded.status, data = excluded.data,
+                           synced_at = excluded.synced_at""",
+                    (clip_id, clip_id[:8], clip.get("title"), clip.get("created_at"),
+                     clip.get("status"), json.dumps(clip), now),
+                )
+        return new_ids
+
+    def set_local_path(self, clip_id: str, path: str) -> None:
+        with self.lock, self._connect() as db:
+            db.execute("UPDATE clips SET local_path = ? WHERE id = ?", (str(path), clip_id))
+
+    def sync(self, fetch_page, max_pages: int = SYNC_MAX_PAGES) -> list[str]:
+        """Page the feed (fetch_page(n) -> list of clips) until reaching already-settled clips.
+
+        Returns the IDs inserted by this sync, newest first.
+        """
+        new_ids = []
+        for page in range(max_pages):
+            clips = fetch_page(page)
+            if not clips:
+                break
+            settled = self._settled_ids([c.get("id") for c in clips])
+            new_ids.extend(self.upsert_many(clips))
+            if settled:
+                # Feed is newest-first: everything past a settled known clip is already stored
+                break
+        return new_ids
+
+    def _settled_ids(self, ids: list[str]) -> set[str]:
+        ids = [i for i in ids if i]
+        if not ids:
+            return set()
+        marks = ",".join("?" * len(ids))
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT id FROM clips WHERE id IN ({marks}) AND status IN (?, ?)",
+                (*ids, *FINAL_STATUSES),
+            ).fetchall()
+        return {r["id"] for r in rows}
+
+    # --- Queries ---
+
+    def _clips(self, where: str = "", params: tuple = (), order: str = "created_at DESC") -> list[dict]:
+        with self._connect() as db:
+            rows = db.execute(f"SELECT data, local_path FROM clips {where} ORDER BY {order}", params).fetchall()
+        clips = []
+        for row in rows:
+            clip = json.loads(row["data"])
+            if row["local_path"]:
+                clip["local_path"] = row["local_path"]
+            clips.append(clip)
+        return clips
+
+    def get(self, clip_id: str) -> dict | None:
+        found = self._clips("WHERE id = ?", (clip_id,))
+        return found[0] if found else None
+
+    def by_prefix(self, prefix: str) -> dict | None:
+        """Most recent clip whose ID starts with the 8-char prefix."""
+        found = self._clips("WHERE prefix = ?", (prefix[:8],))
+        return found[0] if found else None
+
+    def by_title(self, title: str) -> list[dict]:
+        return self._clips("WHERE title = ?", (title,))
+
+    def since(self, created_at: str) -> list[dict]:
+        """Clips created at or after an ISO timestamp, newest first."""
+        return self._clips("WHERE created_at >= ?", (created_at,))
+
+    def all(self) -> list[dict]:
+        return self._clips()
+
+    def prefix_index(self) -> dict[str, dict]:
+        """Map 8-char prefix -> clip for every stored clip (newest wins)."""
+        return {clip["id"][:8]: clip for clip in reversed(self.all())}
+
+    def __len__(self):
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
@@ -0,0 +1,133 @@
+"""
+disk_cache.py — Content-addressed JSON cache on disk with LRU eviction.
+
+Each entry is one JSON file under .refrakt/caches/<name>/, keyed by a caller-built
+string (typically a file content hash plus a version tag). Reads bump the entry's
+mtime, and writes prune the least recently used entries once the directory grows
+past max_bytes. Batch writers can pass prune=False and call prune() once at the end.
+
+Usage:
+    from disk_cache import DiskCache, file_sha256
+
+    cache = DiskCache("features", max_bytes=200 * 1024 * 1024)
+    key = f"{file_sha256('clip.m4a')}-v1"
+    entry = cache.get(key) or {}
+    cache.put(key, {"variety": {...}})
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_ROOT = BASE_DIR / ".refrakt" / "caches"
+
+_hash_memo = {}
+
+
+def _json_default(obj):
+    """Serialize numpy scalars/arrays (np.float64, np.bool_, ndarray) as plain JSON."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def file_sha256(path, chunk_size=1 << 20) -> str:
+    """SHA-256 of a file's contents, memoized per (path, size, mtime) for this process."""
+    path = os.path.abspath(str(path))
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns)
+    digest = _hash_memo.get(memo_key)
+    if digest:
+        return digest
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _hash_memo[memo_key] = digest
+    return digest
+
+
+class DiskCache:
+    """Directory of JSON entries with size-bounded LRU eviction."""
+
+    def __init__(self, name: str, max_bytes: int = 100 * 1024 * 1024):
+        self.dir = CACHE_ROOT / name
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached dict for key, or None. Marks the entry as recently used."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict, prune: bool = True) -> None:
+        """Atomically write value for key, then (unless prune=False) evict old entries if over budget."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.dir, suffix=".tmp", prefix=".entry_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f, default=_json_default)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete least recently used entries until the cache fits max_bytes. Returns count removed."""
+        try:
+            entries = [e for e in os.scandir(self.dir) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return 0
+
+        stats = []
+        total = 0
+        for e in entries:
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            stats.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for _, size, path in sorted(stats):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry in this cache."""
+        if not self.dir.exists():
+            return
+        for e in os.scandir(self.dir):
+            if e.name.endswith(".json"):
+                try:
+                    os.unlink(e.path)
+                except OSError:
+                    pass
@@ -13,17 +13,15 @@ Usage:
     .venv/bin/python download_tracks.py        # uses DEFAULT_CLIP_IDS below
 
 Auth is read from .refrakt/suno_session.json (see .gitignore).
-The JWT is auto-refreshed via the Clerk token endpoint.
+The JWT is auto-refreshed via the Clerk token endpoint (suno.JWTManager).
 """
 
 import json
 import os
 import re
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
-import requests
 from dotenv import load_dotenv
 
 _BASE_DIR = Path(__file__).parent.parent
@@ -32,6 +30,14 @@ load_dotenv(_BASE_DIR / ".env")
 SESSION_FILE = str(_BASE_DIR / ".refrakt" / "suno_session.json")
 OUTPUT_DIR = os.path.expanduser(os.getenv("WIP_DIR", "~/Google Drive/My Drive/SunoTemp/"))
 
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+import http_client
+from suno import JWTManager, wait_for_completion
+
 # Hardcoded clip IDs from the initial test generation (2026-02-24).
 # Pass IDs on the command line to override.
 DEFAULT_CLIP_IDS = [
@@ -45,37 +51,6 @@ def load_session():
         return json.load(f)
 
 
-def refresh_jwt(session):
-    """Exchange the long-lived __client token for a fresh short-lived JWT."""
-    session_id = session["session_id"]
-    client_token = session["client_token"]
-    url = f"https://auth.suno.com/v1/client/sessions/{session_id}/tokens"
-    r = requests.post(
-        url,
-        headers={
-            "Cookie": f"__client={client_token}",
-            "Origin": "https://suno.com",
-        },
-        params={"_clerk_js_version": "5.36.2"},
-    )
-    r.raise_for_status()
-    return r.json()["jwt"]
-
-
-def poll_clips(clip_ids, jwt, django_session):
-    """Fetch clip info from the feed endpoint."""
-    ids_param = ",".join(clip_ids)
-    r = requests.get(
-        f"https://studio-api.prod.suno.com/api/feed/?ids={ids_param}",
-        headers={
-            "Authorization": f"Bearer {jwt}",
-            "Cookie": f"sessionid={django_session}",
-        },
-    )
-    r.raise_for_status()
-    return r.json()
-
-
 def sanitize_filename(name):
     """Convert a title to a safe filename (no path separators or special chars)."""
     name = re.sub(r'[\\/*?:"<>|]', "", name)
@@ -85,7 +60,7 @@ def sanitize_filename(name):
 
 def download_audio(url, dest_path):
     """Stream-download audio to dest_path."""
-    r = requests.get(url, stream=True)
+    r = http_client.get(url, stream=True, timeout=http_client.DOWNLOAD_TIMEOUT)
     r.raise_for_status()
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
     with open(dest_path, "wb") as f:
@@ -93,33 +68,17 @@ def download_audio(url, dest_path):
             f.write(chunk)
 
 
-def wait_for_completion(clip_ids, jwt, django_session, timeout=300, interval=5):
-    """Poll until all clips are complete (or error/timeout)."""
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        clips = poll_clips(clip_ids, jwt, django_session)
-        statuses = {c["id"]: c["status"] for c in clips}
-        pending = [cid for cid, s in statuses.items() if s not in ("complete", "error")]
-        if not pending:
-            return clips
-        print(f"  Waiting... {len(pending)} clip(s) still processing: {pending}")
-        time.sleep(interval)
-    raise TimeoutError(f"Clips not complete after {timeout}s")
-
-
 def main():
     clip_ids = sys.argv[1:] if len(sys.argv) > 1 else DEFAULT_CLIP_IDS
 
     print(f"Loading session from {SESSION_FILE}...")
     session = load_session()
 
-    print("Refreshing JWT...")
-    jwt = refresh_jwt(session)
-    django_session = session["django_session_id"]
-    print("  JWT refreshed.")
+    # Re-mints the ~60s JWT as needed (and retries a 401) during long polls
+    jwt = JWTManager(session)
 
     print(f"Polling {len(clip_ids)} clip(s)...")
-    clips = wait_for_completion(clip_ids, jwt, django_session)
+    clips = wait_for_completion(session, jwt, clip_ids)
 
     date_dir = os.path.join(OUTPUT_DIR, datetime.now().strftime("%Y-%m-%d"))
     os.makedirs(date_dir, exist_ok=True)
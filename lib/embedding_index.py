@@ -0,0 +1,192 @@
+"""
+embedding_index.py — Library-wide similarity index over every evaluated clip.
+
+Stores the 59-dim audio_analysis embeddings of all clips ever evaluated as an
+L2-normalized float32 matrix (.refrakt/caches/embeddings/embeddings.npy, opened
+memory-mapped) alongside a JSON manifest of content hashes and paths. New clips
+are checked against the whole catalogue with one matrix product, so "this sounds
+like last month's track" is caught at library scale.
+
+hnswlib is optional — when installed and the library is large, queries go
+through an approximate-nearest-neighbour graph instead of the brute-force product.
+
+Usage:
+    from embedding_index import EmbeddingIndex
+
+    index = EmbeddingIndex()
+    matches = index.query(embeddings, threshold=0.93)   # one list per query row
+    index.add_many(keys, paths, embeddings)
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# hnswlib is optional — ANN queries for large libraries, brute force otherwise
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+BASE_DIR = Path(__file__).parent.parent
+INDEX_DIR = BASE_DIR / ".refrakt" / "caches" / "embeddings"
+ANN_MIN_ITEMS = 20000  # below this, one float32 matmul is faster than the graph
+ANN_NEIGHBOURS = 20
+
+
+def normalize_rows(embeddings) -> np.ndarray:
+    """Return embeddings as a 2-D float32 array with unit-length rows (zero rows stay zero)."""
+    m = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIndex:
+    """Persistent normalized embedding matrix + manifest, with optional ANN lookup."""
+
+    def __init__(self, directory: str | Path = INDEX_DIR):
+        self.dir = Path(directory)
+        self.matrix_path = self.dir / "embeddings.npy"
+        self.manifest_path = self.dir / "manifest.json"
+        self.ann_path = self.dir / "embeddings.hnsw"
+
+        self.items = []
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path) as f:
+                    self.items = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.items = []
+
+        self.matrix = None
+        if self.items and self.matrix_path.exists():
+            self.matrix = np.load(self.matrix_path, mmap_mode="r")
+            if self.matrix.shape[0] != len(self.items):
+                # Manifest and matrix out of sync (interrupted write) — start over
+                self.items, self.matrix = [], None
+
+        self._keys = {item["key"]: i for i, item in enumerate(self.items)}
+        self._ann = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    # --- Queries ---
+
+    def query(self, embeddings, threshold=0.93, exclude_keys=()):
+        """Find library clips with cosine similarity above threshold for each embedding.
+
+        Returns a list (one per query row) of match dicts sorted by similarity:
+            {"key": ..., "path": ..., "similarity": float}
+        """
+        queries = normalize_rows(embeddings)
+        if not self.items:
+            return [[] for _ in range(len(queries))]
+
+        exclude = {self._keys[k] for k in exclude_keys if k in self._keys}
+
+        if self._use_ann():
+            rows, cols, sims = self._ann_candidates(queries, threshold)
+        else:
+            sims_matrix = queries @ np.asarray(self.matrix).T
+            rows, cols = np.nonzero(sims_matrix > threshold)
+            sims = sims_matrix[rows, cols]
+
+        matches = [[] for _ in range(len(queries))]
+        for r, c, sim in zip(rows.tolist(), cols.tolist(), sims.tolist()):
+            if c in exclude:
+                continue
+            item = self.items[c]
+            matches[r].append({"key": item["key"], "path": item["path"], "similarity": float(sim)})
+        for m in matches:
+            m.sort(key=lambda x: x["similarity"], reverse=True)
+        return matches
+
+    def _use_ann(self):
+        return HAS_HNSWLIB and len(self.items) >= ANN_MIN_ITEMS
+
+    def _ann_candidates(self, queries, threshold):
+        ann = self._load_ann()
+        k = min(ANN_NEIGHBOURS, len(self.items))
+        labels, distances = ann.knn_query(queries, k=k)
+        sims = 1.0 - distances  # hnswlib "ip" space returns 1 - dot
+        rows, cols = np.nonzero(sims > threshold)
+        return rows, labels[rows, cols].astype(np.int64), sims[rows, cols]
+
+    def _load_ann(self):
+        if self._ann is not None:
+            return self._ann
+        dim = self.matrix.shape[1]
+        ann = hnswlib.Index(space="ip", dim=dim)
+        if self.ann_path.exists():
+            ann.load_index(str(self.ann_path), max_elements=len(self.items))
+            if ann.get_current_count() == len(self.items):
+                self._ann = ann
+                return ann
+            ann = hnswlib.Index(space="ip", dim=dim)
+        ann.init_index(max_elements=len(self.items), ef_construction=200, M=16)
+        ann.add_items(np.asarray(self.matrix), np.arange(len(self.items)))
+        ann.set_ef(max(ANN_NEIGHBOURS * 2, 50))
+        ann.save_index(str(self.ann_path))
+        self._ann = ann
+        return ann
+
+    # --- Updates ---
+
+    def add_many(self, keys, paths, embeddings) -> int:
+        """Append new clips (skipping keys already indexed) and persist. Returns count added."""
+        rows = normalize_rows(embeddings)
+        new_items, new_rows = [], []
+        now = datetime.now(timezone.utc).isoformat()
+        for key, path, row in zip(keys, paths, rows):
+            if key in self._keys or not np.any(row):
+                continue
+            self._keys[key] = len(self.items) + len(new_items)
+            new_items.append({"key": key, "path": str(path), "added": now})
+            new_rows.append(row)
+        if not new_items:
+            return 0
+
+        stacked = np.vstack(new_rows).astype(np.float32)
+        if self.matrix is not None:
+            stacked = np.concatenate([np.asarray(self.matrix), stacked])
+        self.items.extend(new_items)
+        self._save(stacked)
+        return len(new_items)
+
+    def add(self, key, path, embedding) -> bool:
+        return self.add_many([key], [path], [embedding]) == 1
+
+    def _save(self, matrix):
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_npy = tempfile.mkstemp(dir=self.dir, suffix=".npy", prefix=".embeddings_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_npy, self.matrix_path)
+        except Exception:
+            os.unlink(tmp_npy)
+            raise
+
+        fd, tmp_json = tempfile.mkstemp(dir=self.dir, suffix=".tmp", prefix=".manifest_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.items, f, indent=1)
+            os.replace(tmp_json, self.manifest_path)
+        except Exception:
+            os.unlink(tmp_json)
+            raise
+
+        self.matrix = np.load(self.matrix_path, mmap_mode="r")
+        self._ann = None
+        if self.ann_path.exists():
+            self.ann_path.unlink()
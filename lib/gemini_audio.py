@@ -5,19 +5,80 @@ Uploads an audio file to Gemini and asks it to evaluate the track against
 intended style tags, mood, and production quality. Returns structured JSON.
 
 Requires GEMINI_API_KEY in .env.
+
+Results are cached under .refrakt/caches/gemini_eval/, keyed by the audio's
+content hash, the model, every prompt input and PROMPT_VERSION. Pass
+refresh=True to force a new evaluation.
+
+Uploads use a mono low-bitrate Opus proxy (GEMINI_PROXY_BITRATE, default 48k)
+created once and cached next to the clip as .<stem>.proxy-<bitrate>.ogg.
+Set GEMINI_PROXY_BITRATE=off to upload originals. bin/gemini-proxy-bench
+compares verdicts and wall time across bitrates.
+
+Uploads are kept for reuse rather than deleted after each call: a registry at
+.refrakt/caches/gemini_uploads.json maps content hash + bitrate to the Gemini
+file name and expiry, so re-evaluating a clip (new prompt, pick then
+eval-batch) references the existing upload. A daemon thread sweeps expired entries.
+
+evaluate_candidates() ranks every candidate for one title in a single request
+(clips interleaved with "CLIP A:" labels), so scores share one scale. It falls
+back to per-clip evaluation when the combined audio exceeds
+GEMINI_COMPARE_MAX_SECONDS (default 1800).
 """
 
+import hashlib
 import json
 import os
+import random
 import re
+import shutil
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from google import genai
+from google.genai import types
 
 BASE_DIR = Path(__file__).parent.parent
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from disk_cache import CACHE_ROOT, DiskCache, file_sha256
+
+# Bump whenever the evaluation prompt changes — invalidates cached verdicts
+PROMPT_VERSION = 1
+
+_eval_cache = DiskCache("gemini_eval", max_bytes=50 * 1024 * 1024)
+
+# Concurrency / quota settings for evaluate_tracks and every API call
+GEMINI_MAX_WORKERS = int(os.getenv("GEMINI_MAX_WORKERS", "4"))
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))  # generate_content requests per minute
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 2.0  # seconds; doubles per attempt, with jitter
+
+# Comparative mode: bump when the ranking prompt changes; beyond the audio budget
+# (Gemini counts ~32 tokens per second of audio) fall back to per-clip evaluation
+COMPARE_PROMPT_VERSION = 1
+COMPARE_MAX_AUDIO_SECONDS = float(os.getenv("GEMINI_COMPARE_MAX_SECONDS", "1800"))
+
+# Upload proxy: mono Opus at this bitrate ("off" or "" = upload the original file)
+GEMINI_PROXY_BITRATE = os.getenv("GEMINI_PROXY_BITRATE", "48k")
+
+# Upload registry: Files API uploads live ~48h server-side; reuse them until
+# REUSE_MARGIN before expiry, and sweep expired entries in the background
+UPLOAD_REGISTRY_FILE = CACHE_ROOT / "gemini_uploads.json"
+UPLOAD_DEFAULT_TTL = 47 * 3600  # used when the API doesn't report expiration_time
+UPLOAD_REUSE_MARGIN = 3600
+UPLOAD_SWEEP_INTERVAL = 15 * 60
+
 
 def _load_api_key() -> str:
     key = os.environ.get("GEMINI_API_KEY")
@@ -33,42 +94,157 @@ def _load_api_key() -> str:
     sys.exit(1)
 
 
-def evaluate_track(
+class TokenBucket:
+    """Thread-safe token bucket — acquire() blocks until a request slot is free."""
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, min(rate_per_minute / 6.0, 10.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiter = TokenBucket(GEMINI_RPM)
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide genai.Client (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = genai.Client(api_key=_load_api_key())
+        return _client
+
+
+def _is_missing_file(error: Exception) -> bool:
+    """403/404 on generate usually means a referenced upload expired or was deleted."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code in (403, 404)
+    text = str(error)
+    return "NOT_FOUND" in text or "PERMISSION_DENIED" in text
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429 (quota) and 5xx responses are worth retrying; other client errors are not."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    text = str(error)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text or "UNAVAILABLE" in text
+
+
+def call_with_retries(fn, *args, rate_limited: bool = False, **kwargs):
+    """Call fn, retrying 429/5xx with jittered exponential backoff.
+
+    rate_limited=True draws a token from the shared per-minute bucket before each attempt.
+    """
+    for attempt in range(MAX_RETRIES):
+        if rate_limited:
+            _rate_limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1 or not _is_retryable(e):
+                raise
+            delay = RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"  Gemini {getattr(e, 'code', 'error')}; retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{MAX_RETRIES - 1})", file=sys.stderr)
+            time.sleep(delay)
+
+
+def _proxy_enabled(bitrate) -> bool:
+    return bool(bitrate) and str(bitrate).lower() not in ("off", "none", "0")
+
+
+def make_eval_proxy(audio_path, bitrate: str = GEMINI_PROXY_BITRATE) -> Path:
+    """Return a mono low-bitrate Opus copy of audio_path for uploading, creating it once.
+
+    The proxy lives next to the clip (.<stem>.proxy-<bitrate>.ogg) and is rebuilt
+    only when the source is newer. Falls back to the original file if ffmpeg is
+    unavailable or fails.
+    """
+    src = Path(audio_path)
+    if not _proxy_enabled(bitrate):
+        return src
+    proxy = src.with_name(f".{src.stem}.proxy-{bitrate}.ogg")
+    try:
+        if proxy.stat().st_size > 0 and proxy.stat().st_mtime >= src.stat().st_mtime:
+            return proxy
+    except FileNotFoundError:
+        pass
+
+    if not shutil.which("ffmpeg"):
+        return src
+    tmp = proxy.with_name(proxy.name + ".part")
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-i", str(src), "-vn", "-ac", "1",
+             "-c:a", "libopus", "-b:a", str(bitrate), "-f", "ogg", "-y", str(tmp)],
+            capture_output=True, text=True, timeout=60,
+        )
+        if result.returncode == 0 and tmp.exists() and tmp.stat().st_size > 0:
+            os.replace(tmp, proxy)
+            return proxy
+        print(f"  WARNING: proxy encode failed ({result.stderr[:200]}); uploading original",
+              file=sys.stderr)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"  WARNING: proxy encode failed ({e}); uploading original", file=sys.stderr)
+    if tmp.exists():
+        tmp.unlink()
+    return src
+
+
+def _eval_cache_key(file_path, tags, mood, title, is_instrumental, intended_lyrics,
+                    upload_bitrate=GEMINI_PROXY_BITRATE) -> str:
+    signature = json.dumps([
+        file_sha256(file_path), GEMINI_MODEL, tags, mood, title,
+        bool(is_instrumental), intended_lyrics, PROMPT_VERSION,
+        str(upload_bitrate) if _proxy_enabled(upload_bitrate) else "original",
+    ])
+    return hashlib.sha256(signature.encode()).hexdigest()
+
+
+def cached_evaluation(
     audio_path: str,
     tags: str = "",
     mood: str = "",
     title: str = "",
     is_instrumental: bool = True,
     intended_lyrics: str = "",
-) -> dict:
-    """
-    Upload an audio file to Gemini and get a structured evaluation.
-
-    Returns a dict with keys: vocal_contamination, genre_match, mood_match,
-    production_quality, artistic_interest, verdict, notes.
-    """
-    api_key = _load_api_key()
-    client = genai.Client(api_key=api_key)
-
-    # Upload the audio file
-    # Use pathlib.Path object — the SDK's string path validation chokes on spaces in iCloud paths
+    upload_bitrate: str = GEMINI_PROXY_BITRATE,
+) -> dict | None:
+    """Return the cached evaluate_track result for these inputs, or None."""
     file_path = Path(audio_path).resolve()
     if not file_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {file_path}")
+        return None
+    return _eval_cache.get(_eval_cache_key(file_path, tags, mood, title, is_instrumental,
+                                           intended_lyrics, upload_bitrate))
 
-    # Determine mime type
-    suffix = file_path.suffix.lower()
-    mime_map = {".mp3": "audio/mpeg", ".m4a": "audio/mp4", ".wav": "audio/wav", ".ogg": "audio/ogg"}
-    mime_type = mime_map.get(suffix, "audio/mpeg")
-
-    # Upload using file IO to avoid SDK path-string issues
-    with open(file_path, "rb") as f:
-        audio_file = client.files.upload(
-            file=f,
-            config={"mime_type": mime_type},
-        )
 
-    # Build the evaluation prompt
+def build_prompt(
+    tags: str = "",
+    mood: str = "",
+    title: str = "",
+    is_instrumental: bool = True,
+    intended_lyrics: str = "",
+) -> str:
+    """Build the single-track evaluation prompt (see PROMPT_VERSION)."""
     instrumental_check = (
         "1. VOCAL CONTAMINATION: Are any vocals, singing, speech, humming, or voice sounds "
         "audible? This should be a purely instrumental track. Answer yes/no with description."
@@ -125,42 +301,437 @@ Respond ONLY with valid JSON in this exact format (no markdown, no code fences):
   "summary": "One sentence overall impression"
 }}"""
 
+    return prompt
+
+
+def evaluate_track(
+    audio_path: str,
+    tags: str = "",
+    mood: str = "",
+    title: str = "",
+    is_instrumental: bool = True,
+    intended_lyrics: str = "",
+    refresh: bool = False,
+    upload_bitrate: str = GEMINI_PROXY_BITRATE,
+) -> dict:
+    """
+    Upload an audio file to Gemini and get a structured evaluation.
+
+    Cached results are returned without any API call unless refresh=True.
+    The upload is a mono proxy at upload_bitrate ("off" uploads the original).
+
+    Returns a dict with keys: vocal_contamination, genre_match, mood_match,
+    production_quality, artistic_interest, verdict, notes.
+    """
+    # Use pathlib.Path object — the SDK's string path validation chokes on spaces in iCloud paths
+    file_path = Path(audio_path).resolve()
+    if not file_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+    cache_key = _eval_cache_key(file_path, tags, mood, title, is_instrumental, intended_lyrics,
+                                upload_bitrate)
+    if not refresh:
+        cached = _eval_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    prompt = build_prompt(tags, mood, title, is_instrumental, intended_lyrics)
+
     try:
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=[prompt, audio_file],
-        )
+        response = generate_with_audio(
+            [file_path], lambda files: [prompt, files[0]], upload_bitrate)
     except Exception as e:
-        # Clean up uploaded file on error
+        raise RuntimeError(f"Gemini API call failed: {e}") from e
+
+    result = _parse_response(response.text)
+    if "error" not in result:
+        _eval_cache.put(cache_key, result)
+    return result
+
+
+class UploadRegistry:
+    """Local map of audio content hash -> live Gemini upload (name, uri, expiry).
+
+    Stored as one JSON file shared by every command; each read re-loads it so
+    concurrent processes see each other's uploads. Per-key locks make parallel
+    evaluations of the same clip upload it once.
+    """
+
+    def __init__(self, path: Path = UPLOAD_REGISTRY_FILE):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self._key_locks = {}
+        self._sweeper = None
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, entries: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp", prefix=".uploads_")
         try:
-            client.files.delete(name=audio_file.name)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f, indent=1)
+            os.replace(tmp_path, self.path)
         except Exception:
-            pass
-        raise RuntimeError(f"Gemini API call failed: {e}") from e
+            os.unlink(tmp_path)
+            raise
+
+    def key_lock(self, key: str) -> threading.Lock:
+        with self.lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def lookup(self, key: str) -> dict | None:
+        """Return the entry for key if it stays valid for at least UPLOAD_REUSE_MARGIN."""
+        with self.lock:
+            entry = self._load().get(key)
+        if entry and entry.get("expires", 0) - time.time() > UPLOAD_REUSE_MARGIN:
+            return entry
+        return None
+
+    def record(self, key: str, audio_file, source: Path) -> dict:
+        expires = getattr(audio_file, "expiration_time", None)
+        entry = {
+            "name": audio_file.name,
+            "uri": audio_file.uri,
+            "mime_type": audio_file.mime_type,
+            "expires": expires.timestamp() if expires else time.time() + UPLOAD_DEFAULT_TTL,
+            "source": str(source),
+        }
+        with self.lock:
+            entries = self._load()
+            entries[key] = entry
+            self._save(entries)
+        return entry
+
+    def forget(self, key: str) -> dict | None:
+        with self.lock:
+            entries = self._load()
+            entry = entries.pop(key, None)
+            if entry is not None:
+                self._save(entries)
+        return entry
+
+    def sweep(self, client) -> int:
+        """Drop expired entries (and ones whose source clip is gone), deleting the remote files.
+
+        Returns the number of entries removed.
+        """
+        now = time.time()
+        with self.lock:
+            entries = self._load()
+            stale = {k: e for k, e in entries.items()
+                     if e.get("expires", 0) <= now or not Path(e.get("source", "")).exists()}
+            if stale:
+                self._save({k: e for k, e in entries.items() if k not in stale})
+        for entry in stale.values():
+            if entry.get("expires", 0) > now:
+                release_upload(client, entry["name"])
+        return len(stale)
+
+    def start_sweeper(self, client, interval: float = UPLOAD_SWEEP_INTERVAL) -> None:
+        """Run sweep() now and then every interval seconds on a daemon thread (once per process)."""
+        with self.lock:
+            if self._sweeper is not None:
+                return
+
+            def _loop():
+                while True:
+                    try:
+                        self.sweep(client)
+                    except Exception as e:
+                        print(f"  Upload sweep failed: {e}", file=sys.stderr)
+                    time.sleep(interval)
+
+            self._sweeper = threading.Thread(target=_loop, name="gemini-upload-sweep", daemon=True)
+            self._sweeper.start()
+
+
+_upload_registry = UploadRegistry()
+
+
+def _upload_key(file_path: Path, upload_bitrate: str) -> str:
+    label = str(upload_bitrate) if _proxy_enabled(upload_bitrate) else "original"
+    return f"{file_sha256(file_path)}-{label}"
+
+
+def upload_audio(client, file_path: Path, upload_bitrate: str = GEMINI_PROXY_BITRATE):
+    """Return a Files API reference for the clip (or its proxy), reusing a live upload if registered."""
+    _upload_registry.start_sweeper(client)
+    key = _upload_key(file_path, upload_bitrate)
+    with _upload_registry.key_lock(key):
+        entry = _upload_registry.lookup(key)
+        if entry is None:
+            audio_file = _upload_file(client, file_path, upload_bitrate)
+            entry = _upload_registry.record(key, audio_file, file_path)
+    return types.File(name=entry["name"], uri=entry["uri"], mime_type=entry["mime_type"])
+
 
-    # Clean up uploaded file
+def _upload_file(client, file_path: Path, upload_bitrate: str):
+    """Upload the clip (or its proxy) to the Gemini Files API. Returns the File object."""
+    upload_path = make_eval_proxy(file_path, upload_bitrate)
+
+    # Determine mime type
+    suffix = upload_path.suffix.lower()
+    mime_map = {".mp3": "audio/mpeg", ".m4a": "audio/mp4", ".wav": "audio/wav", ".ogg": "audio/ogg"}
+    mime_type = mime_map.get(suffix, "audio/mpeg")
+
+    # Upload using file IO to avoid SDK path-string issues
+    def _upload():
+        with open(upload_path, "rb") as f:
+            return client.files.upload(file=f, config={"mime_type": mime_type})
+
+    return call_with_retries(_upload)
+
+
+def release_upload(client, name: str) -> None:
+    """Delete an uploaded file, ignoring failures (files expire server-side anyway)."""
     try:
-        client.files.delete(name=audio_file.name)
+        client.files.delete(name=name)
     except Exception:
         pass
 
-    # Parse the JSON response
-    text = response.text.strip()
+
+def generate_with_audio(file_paths: list, build_contents, upload_bitrate: str = GEMINI_PROXY_BITRATE):
+    """Run generate_content over uploaded clips, reusing registered uploads.
+
+    build_contents(files) receives one file reference per path and returns the
+    contents list. If Gemini rejects a reused upload (expired or deleted early),
+    the registry entries are dropped and the request is retried once with fresh uploads.
+    """
+    client = get_client()
+    for attempt in range(2):
+        files = [upload_audio(client, Path(p), upload_bitrate) for p in file_paths]
+        try:
+            return call_with_retries(
+                client.models.generate_content,
+                model=GEMINI_MODEL,
+                contents=build_contents(files),
+                rate_limited=True,
+            )
+        except Exception as e:
+            if attempt == 1 or not _is_missing_file(e):
+                raise
+            for p in file_paths:
+                _upload_registry.forget(_upload_key(Path(p), upload_bitrate))
+
+
+def _parse_response(text: str) -> dict:
+    """Parse Gemini's JSON answer, tolerating markdown fences."""
+    text = text.strip()
     # Clean up any markdown fencing (handles ```json and ``` variants)
     text = re.sub(r'^```\w*\n?', '', text)
     text = re.sub(r'\n?```$', '', text)
     text = text.strip()
 
     try:
-        result = json.loads(text)
+        return json.loads(text)
     except json.JSONDecodeError:
-        result = {
+        return {
             "error": "Failed to parse Gemini response",
             "raw_response": text[:500],
             "verdict": "Marginal",
         }
 
-    return result
+
+def evaluate_tracks(jobs: list[dict], max_workers: int = GEMINI_MAX_WORKERS) -> list:
+    """Evaluate many tracks concurrently on a bounded pool.
+
+    Each job is a dict of evaluate_track keyword arguments (audio_path required).
+    All calls share one client, the per-minute token bucket and retry policy.
+    Returns results in job order; a failed job's slot holds its Exception.
+    """
+    def _run(job):
+        try:
+            return evaluate_track(**job)
+        except Exception as e:
+            return e
+
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        return list(pool.map(_run, jobs))
+
+
+# ---------------------------------------------------------------------------
+# Comparative evaluation — all candidates for one title in a single request
+# ---------------------------------------------------------------------------
+
+def _audio_duration(path) -> float | None:
+    """Container duration in seconds via mutagen, or None if unreadable."""
+    try:
+        import mutagen
+        info = mutagen.File(str(path))
+        if info is not None and info.info and info.info.length:
+            return float(info.info.length)
+    except Exception:
+        pass
+    return None
+
+
+def build_compare_prompt(
+    labels: list[str],
+    tags: str = "",
+    mood: str = "",
+    title: str = "",
+    is_instrumental: bool = True,
+    intended_lyrics: str = "",
+) -> str:
+    """Build the ranking prompt for several candidate clips (see COMPARE_PROMPT_VERSION)."""
+    lyrics_note = ""
+    if intended_lyrics and not is_instrumental:
+        lyrics_note = f"\nINTENDED LYRICS (excerpt):\n{intended_lyrics[:500]}\n"
+    vocal_field = (
+        '"vocal_contamination": true/false,' if is_instrumental
+        else '"vocal_quality": 1-5,'
+    )
+    return f"""You are an expert music critic and audio engineer choosing the best of {len(labels)} AI-generated
+candidate versions of the same track. Each clip is preceded by its label ({", ".join(labels)}).
+
+TRACK TITLE: {title}
+INTENDED STYLE TAGS: {tags}
+INTENDED MOOD/CHARACTER: {mood}
+TYPE: {"Instrumental (any vocals are a defect)" if is_instrumental else "Vocal"}
+{lyrics_note}
+Listen to every clip, then score each on one shared scale so the scores are directly comparable:
+genre match, mood match, production quality (artifacts, clipping, abrupt cuts), artistic interest
+(distinctive vs generic stock music), and ending quality. Then rank all clips best to worst.
+
+Respond ONLY with valid JSON in this exact format (no markdown, no code fences):
+{{
+  "clips": [
+    {{
+      "label": "A",
+      {vocal_field}
+      "genre_match": 1-5,
+      "mood_match": 1-5,
+      "production_quality": 1-5,
+      "artistic_interest": 1-5,
+      "ending_quality": "natural" or "abrupt" or "truncated",
+      "overall_score": 1-5,
+      "verdict": "Keep" or "Regenerate" or "Marginal",
+      "summary": "One sentence impression"
+    }}
+  ],
+  "ranking": ["best label", "...", "worst label"],
+  "rationale": "Two sentences on why the winner beats the runner-up"
+}}"""
+
+
+def _rank_per_clip(audio_paths, results) -> list:
+    """Order paths by (overall_score, artistic_interest), keeping input order on ties."""
+    scored = [(p, r) for p, r in zip(audio_paths, results) if not isinstance(r, Exception)]
+    scored.sort(key=lambda pr: (pr[1].get("overall_score", 0) or 0,
+                                pr[1].get("artistic_interest", 0) or 0), reverse=True)
+    return [p for p, _ in scored]
+
+
+def evaluate_candidates(
+    audio_paths: list[str],
+    tags: str = "",
+    mood: str = "",
+    title: str = "",
+    is_instrumental: bool = True,
+    intended_lyrics: str = "",
+    refresh: bool = False,
+    upload_bitrate: str = GEMINI_PROXY_BITRATE,
+) -> dict:
+    """Rank all candidates for one title with a single generate call.
+
+    Uploads every clip, asks for calibrated per-clip scores plus a ranking in one
+    request, and caches the answer. Falls back to per-clip evaluate_tracks when
+    the combined audio exceeds COMPARE_MAX_AUDIO_SECONDS (or durations are unknown)
+    or the comparative answer can't be parsed.
+
+    Returns a dict:
+        mode: "comparative" or "per_clip"
+        results: {path: per-clip evaluation dict or Exception}
+        ranking: [paths, best first]
+        winner: best path or None
+        rationale: str (comparative mode only)
+    """
+    paths = [str(Path(p).resolve()) for p in audio_paths]
+    for p in paths:
+        if not Path(p).exists():
+            raise FileNotFoundError(f"Audio file not found: {p}")
+
+    durations = [_audio_duration(p) for p in paths]
+    fits = len(paths) > 1 and all(durations) and sum(durations) <= COMPARE_MAX_AUDIO_SECONDS
+    if fits:
+        try:
+            result = _evaluate_comparative(paths, tags, mood, title, is_instrumental,
+                                           intended_lyrics, refresh, upload_bitrate)
+            if result:
+                return result
+            print("  Comparative answer unusable; falling back to per-clip evaluation", file=sys.stderr)
+        except Exception as e:
+            print(f"  Comparative evaluation failed ({e}); falling back to per-clip", file=sys.stderr)
+
+    per_clip = evaluate_tracks([
+        {"audio_path": p, "tags": tags, "mood": mood, "title": title,
+         "is_instrumental": is_instrumental, "intended_lyrics": intended_lyrics,
+         "refresh": refresh, "upload_bitrate": upload_bitrate}
+        for p in paths
+    ])
+    ranking = _rank_per_clip(paths, per_clip)
+    return {
+        "mode": "per_clip",
+        "results": dict(zip(paths, per_clip)),
+        "ranking": ranking,
+        "winner": ranking[0] if ranking else None,
+    }
+
+
+def _evaluate_comparative(paths, tags, mood, title, is_instrumental, intended_lyrics,
+                          refresh, upload_bitrate) -> dict | None:
+    labels = [chr(ord("A") + i) for i in range(len(paths))]
+    signature = json.dumps([
+        sorted(file_sha256(p) for p in paths), GEMINI_MODEL, tags, mood, title,
+        bool(is_instrumental), intended_lyrics, COMPARE_PROMPT_VERSION,
+        str(upload_bitrate) if _proxy_enabled(upload_bitrate) else "original",
+    ])
+    cache_key = "compare-" + hashlib.sha256(signature.encode()).hexdigest()
+
+    # Cached answers are stored by content hash so label order can't go stale
+    cached = None if refresh else _eval_cache.get(cache_key)
+    if cached is None:
+        prompt = build_compare_prompt(labels, tags, mood, title, is_instrumental, intended_lyrics)
+
+        def _contents(files):
+            contents = [prompt]
+            for label, audio_file in zip(labels, files):
+                contents += [f"CLIP {label}:", audio_file]
+            return contents
+
+        response = generate_with_audio(paths, _contents, upload_bitrate)
+
+        answer = _parse_response(response.text)
+        by_label = {c.get("label"): c for c in answer.get("clips", []) if isinstance(c, dict)}
+        if "error" in answer or set(by_label) != set(labels):
+            return None
+        hashes = {label: file_sha256(p) for label, p in zip(labels, paths)}
+        ranking = [hashes[l] for l in answer.get("ranking", []) if l in hashes]
+        ranking += [h for h in hashes.values() if h not in ranking]
+        cached = {
+            "clips": {hashes[l]: by_label[l] for l in labels},
+            "ranking": ranking,
+            "rationale": answer.get("rationale", ""),
+        }
+        _eval_cache.put(cache_key, cached)
+
+    path_by_hash = {file_sha256(p): p for p in paths}
+    ranking = [path_by_hash[h] for h in cached["ranking"] if h in path_by_hash]
+    return {
+        "mode": "comparative",
+        "results": {path_by_hash[h]: clip for h, clip in cached["clips"].items() if h in path_by_hash},
+        "ranking": ranking,
+        "winner": ranking[0] if ranking else None,
+        "rationale": cached.get("rationale", ""),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""
+http_client.py — Shared pooled HTTP sessions for the Suno API, Clerk auth and CDN.
+
+Every module that talks to studio-api.prod.suno.com, auth.suno.com or
+cdn1.suno.ai goes through here instead of bare requests.get/post, so a poll or
+download loop of dozens of calls reuses keep-alive connections (one pool per
+host) rather than paying a TCP+TLS handshake each time.
+
+Policies:
+    - Every call gets a (connect, read) timeout unless the caller passes one.
+    - GET/HEAD retry connection errors and 429/5xx with exponential backoff,
+      honouring Retry-After. POST is not retried unless retry_unsafe=True
+      (only for calls that are safe to repeat, like minting a JWT).
+    - The final response is returned as-is; callers still raise_for_status().
+
+Usage:
+    import http_client
+
+    r = http_client.get(url, headers=...)
+    r = http_client.post(url, json=..., retry_unsafe=True)
+    r = http_client.get(cdn_url, stream=True, timeout=http_client.DOWNLOAD_TIMEOUT)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5, 30)     # (connect, read) seconds
+DOWNLOAD_TIMEOUT = (5, 120)   # CDN streams: read timeout is per chunk, not total
+POOL_MAXSIZE = 16             # keep-alive connections kept per host
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5          # 0.5s, 1s, 2s between attempts
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _make_session(retry_unsafe: bool) -> requests.Session:
+    methods = None if retry_unsafe else frozenset({"GET", "HEAD", "OPTIONS"})  # None = every method
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=methods,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(retry_unsafe: bool = False) -> requests.Session:
+    """Return the process-wide pooled session for the given retry policy."""
+    with _sessions_lock:
+        session = _sessions.get(retry_unsafe)
+        if session is None:
+            session = _sessions[retry_unsafe] = _make_session(retry_unsafe)
+        return session
+
+
+def request(method: str, url: str, retry_unsafe: bool = False, **kwargs) -> requests.Response:
+    """requests.request over the shared pool, with DEFAULT_TIMEOUT unless timeout is given."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session(retry_unsafe).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -15,8 +15,16 @@ Usage:
     # Just tag matching
     scores = match_tags("track.mp3", ["melodic house", "driving bass", "shimmering pads"])
 
+    # Many clips in one batched forward pass
+    per_clip = match_tags_batch(["a.m4a", "b.m4a"], ["melodic house", "driving bass"])
+
     # Quick text report
     text = quick_report("track.mp3", tags="melodic house, driving bass, 124 BPM")
+
+CLAP embeddings go through the persistent worker (bin/clap-worker) when one is
+running at CLAP_WORKER_URL, so the ~600MB model is loaded once across commands.
+Otherwise the model is loaded in-process. Text embeddings are memoized per
+(checkpoint, label) in memory and under .refrakt/caches/clap_text/.
 """
 
 import json
@@ -33,12 +41,22 @@ warnings.filterwarnings("ignore", category=UserWarning, message=".*PySoundFile.*
 
 BASE_DIR = Path(__file__).parent.parent
 
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from disk_cache import DiskCache
+
 # ---------------------------------------------------------------------------
 # CLAP — Zero-shot audio→text matching
 # ---------------------------------------------------------------------------
 
 _clap_model = None
 
+# Identifies the weights behind cached text embeddings — change it when swapping checkpoints
+CLAP_CHECKPOINT = "HTSAT-tiny/music_audioset_epoch_15_esc_90.14"
+
 
 def _get_clap_model():
     """Lazy-load CLAP model (downloads ~600MB checkpoint on first use)."""
@@ -53,22 +71,164 @@ def _get_clap_model():
     return model
 
 
-def _ensure_wav(audio_path):
-    """CLAP requires WAV input. Convert M4A/MP3 to temp WAV if needed."""
-    path = str(audio_path)
-    if path.endswith(".wav"):
-        return path, False
+CLAP_SAMPLE_RATE = 48000
+
+
+def _decode_audio(audio_path):
+    """Decode any ffmpeg-readable file to mono float32 PCM at 48kHz, entirely in memory.
 
+    ffmpeg writes raw samples to stdout, so no temp WAV ever touches the disk.
+    """
     import subprocess
-    import tempfile
-    wav_path = tempfile.mktemp(suffix=".wav")
     result = subprocess.run(
-        ["ffmpeg", "-i", path, "-ar", "48000", "-ac", "1", "-y", wav_path],
+        ["ffmpeg", "-v", "error", "-i", str(audio_path),
+         "-f", "f32le", "-ac", "1", "-ar", str(CLAP_SAMPLE_RATE), "-"],
         capture_output=True, timeout=30,
     )
     if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg conversion failed: {result.stderr[:200]}")
-    return wav_path, True
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr[:200]}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+CLAP_BATCH_SIZE = 16  # audio clips per forward pass
+CLAP_WORKER_URL = os.getenv("CLAP_WORKER_URL", "http://127.0.0.1:8765")
+WORKER_PROBE_TIMEOUT = 2         # seconds for the one-off /health probe
+WORKER_INFERENCE_TIMEOUT = 600   # seconds per /embed request (decode + forward pass)
+
+_worker_available = None
+
+_text_embedding_memo = {}
+_text_embedding_cache = DiskCache("clap_text", max_bytes=50 * 1024 * 1024)
+
+
+def embed_audio_local(audio):
+    """CLAP audio embeddings computed in this process, batched. Returns (n, d) float32 array.
+
+    audio is a list of file paths and/or already-decoded 48kHz mono float32 arrays.
+    Waveforms go straight to CLAP's in-memory API (get_audio_embedding_from_data).
+    """
+    model = _get_clap_model()
+    embeddings = []
+    for start in range(0, len(audio), CLAP_BATCH_SIZE):
+        chunk = [a if isinstance(a, np.ndarray) else _decode_audio(a)
+                 for a in audio[start:start + CLAP_BATCH_SIZE]]
+        # Same int16 quantization round trip get_audio_embedding_from_filelist applies
+        chunk = [(np.clip(w, -1.0, 1.0) * 32767.0).astype(np.int16).astype(np.float32) / 32767.0
+                 for w in chunk]
+        embeddings.append(model.get_audio_embedding_from_data(x=chunk, use_tensor=False))
+    return np.concatenate(embeddings).astype(np.float32)
+
+
+def embed_text_local(labels):
+    """CLAP text embeddings computed in this process. Returns (n, d) float32 array."""
+    model = _get_clap_model()
+    return np.asarray(model.get_text_embedding(list(labels), use_tensor=False), dtype=np.float32)
+
+
+def _worker_running():
+    """Probe the CLAP worker's /health once per process with a short timeout."""
+    global _worker_available
+    if _worker_available is None:
+        import urllib.request
+        try:
+            with urllib.request.urlopen(f"{CLAP_WORKER_URL}/health", timeout=WORKER_PROBE_TIMEOUT) as resp:
+                _worker_available = bool(json.loads(resp.read()).get("ok"))
+        except (OSError, ValueError):
+            _worker_available = False
+    return _worker_available
+
+
+def _worker_call(endpoint, payload):
+    """POST JSON to the CLAP worker. Returns the decoded response, or None if no worker.
+
+    Once /health has answered, any failure of the worker (including a read
+    timeout during inference) is an error rather than a silent local fallback.
+    """
+    if not _worker_running():
+        return None
+
+    import urllib.error
+    import urllib.request
+    req = urllib.request.Request(
+        f"{CLAP_WORKER_URL}{endpoint}",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=WORKER_INFERENCE_TIMEOUT) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"CLAP worker error: {e.read()[:200]!r}") from e
+    except OSError as e:
+        raise RuntimeError(f"CLAP worker at {CLAP_WORKER_URL} failed during {endpoint}: {e}") from e
+
+
+def embed_audio(audio_paths):
+    """CLAP audio embeddings for many files — via the worker if running, else in-process."""
+    paths = [str(Path(p).resolve()) for p in audio_paths]
+    body = _worker_call("/embed/audio", {"paths": paths})
+    if body is not None:
+        return np.asarray(body["embeddings"], dtype=np.float32)
+    return embed_audio_local(paths)
+
+
+def _text_cache_key(label):
+    import hashlib
+    return hashlib.sha256(f"{CLAP_CHECKPOINT}\n{label}".encode()).hexdigest()
+
+
+def _embed_text_uncached(labels):
+    body = _worker_call("/embed/text", {"labels": list(labels)})
+    if body is not None:
+        return np.asarray(body["embeddings"], dtype=np.float32)
+    return embed_text_local(labels)
+
+
+def embed_text(labels):
+    """CLAP text embeddings — memoized per (checkpoint, label); misses go to the worker or local model."""
+    labels = list(labels)
+    found = {}
+    for label in set(labels):
+        key = (CLAP_CHECKPOINT, label)
+        if key in _text_embedding_memo:
+            found[label] = _text_embedding_memo[key]
+            continue
+        entry = _text_embedding_cache.get(_text_cache_key(label))
+        if entry and entry.get("checkpoint") == CLAP_CHECKPOINT and entry.get("label") == label:
+            found[label] = _text_embedding_memo[key] = np.asarray(entry["embedding"], dtype=np.float32)
+
+    missing = [label for label in dict.fromkeys(labels) if label not in found]
+    if missing:
+        for label, emb in zip(missing, _embed_text_uncached(missing)):
+            found[label] = _text_embedding_memo[(CLAP_CHECKPOINT, label)] = emb
+            _text_embedding_cache.put(_text_cache_key(label), {
+                "checkpoint": CLAP_CHECKPOINT,
+                "label": label,
+                "embedding": emb.tolist(),
+            })
+
+    return np.stack([found[label] for label in labels])
+
+
+def _cosine_scores(audio_embeds, text_embeds):
+    """(n_audio, n_text) cosine similarity matrix."""
+    audio_norm = audio_embeds / np.linalg.norm(audio_embeds, axis=-1, keepdims=True)
+    text_norm = text_embeds / np.linalg.norm(text_embeds, axis=-1, keepdims=True)
+    return audio_norm @ text_norm.T
+
+
+def match_tags_batch(audio_paths, tag_labels):
+    """match_tags for many files with one batched audio pass and one text pass.
+
+    Returns a list (same order as audio_paths) of sorted (label, score) lists.
+    """
+    similarities = _cosine_scores(embed_audio(audio_paths), embed_text(tag_labels))
+    batch = []
+    for row in similarities:
+        results = [(label, float(row[i])) for i, label in enumerate(tag_labels)]
+        results.sort(key=lambda x: x[1], reverse=True)
+        batch.append(results)
+    return batch
 
 
 def match_tags(audio_path, tag_labels):
@@ -82,31 +242,7 @@ def match_tags(audio_path, tag_labels):
         list of (label, score) tuples sorted by score descending.
         Scores are cosine similarities in [-1, 1] range.
     """
-    import torch
-
-    model = _get_clap_model()
-
-    wav_path, is_temp = _ensure_wav(audio_path)
-    try:
-        audio_embed = model.get_audio_embedding_from_filelist(
-            [wav_path], use_tensor=True
-        )
-        text_embed = model.get_text_embedding(tag_labels, use_tensor=True)
-
-        # Cosine similarity between audio and each text label
-        audio_norm = audio_embed / audio_embed.norm(dim=-1, keepdim=True)
-        text_norm = text_embed / text_embed.norm(dim=-1, keepdim=True)
-        similarities = (audio_norm @ text_norm.T).squeeze(0)
-
-        results = []
-        for i, label in enumerate(tag_labels):
-            results.append((label, float(similarities[i])))
-
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
-    finally:
-        if is_temp:
-            os.unlink(wav_path)
+    return match_tags_batch([audio_path], tag_labels)[0]
 
 
 def score_tag_accuracy(audio_path, intended_tags):
@@ -0,0 +1,93 @@
+"""
+phase_timing.py — Per-phase latency histograms for browser submissions.
+
+Each Suno submission is a handful of phases (reload, form_ready, fill,
+create_enabled, generate). The submit paths record how long every phase took
+and print a compact histogram per phase when they finish. That shows which
+wait dominates and whether it is steady or spiky, so tuning is driven by data
+rather than by adding sleeps.
+
+Usage:
+    from phase_timing import PhaseTimings
+
+    timings = PhaseTimings()
+    with timings.phase("open"):
+        open_browser()
+    timings.update({"fill": 0.41, "generate": 1.92})   # seconds, e.g. from run-code
+    print(timings.format())
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30)  # upper bounds in seconds; anything slower lands in "+inf"
+
+
+def _bucket_label(bound) -> str:
+    return f"<{bound:g}s"
+
+
+class PhaseTimings:
+    """Thread-safe collection of phase durations in seconds, kept in first-seen phase order."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: dict[str, list[float]] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self.lock:
+            self.samples.setdefault(phase, []).append(float(seconds))
+
+    def update(self, durations) -> None:
+        """Record {phase: seconds} or [[phase, seconds], ...] (as returned by build_submit_js)."""
+        items = durations.items() if isinstance(durations, dict) else durations
+        for phase, seconds in items:
+            if isinstance(seconds, (int, float)):
+                self.record(phase, seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - t0)
+
+    def summary(self) -> dict:
+        """{phase: {"count", "mean", "p50", "p90", "max", "buckets": {label: n}}}."""
+        with self.lock:
+            samples = {phase: sorted(values) for phase, values in self.samples.items()}
+        result = {}
+        for phase, values in samples.items():
+            n = len(values)
+            buckets = {_bucket_label(b): 0 for b in BUCKETS}
+            buckets["+inf"] = 0
+            for v in values:
+                label = next((_bucket_label(b) for b in BUCKETS if v < b), "+inf")
+                buckets[label] += 1
+            result[phase] = {
+                "count": n,
+                "mean": round(sum(values) / n, 3),
+                "p50": round(values[(n - 1) // 2], 3),
+                "p90": round(values[min(n - 1, int(n * 0.9))], 3),
+                "max": round(values[-1], 3),
+                "buckets": buckets,
+            }
+        return result
+
+    def format(self) -> str:
+        """Human-readable table: one row per phase, stats then non-empty bucket counts."""
+        summary = self.summary()
+        if not summary:
+            return "  (no timings recorded)"
+        width = max(len(phase) for phase in summary)
+        lines = []
+        for phase, s in summary.items():
+            buckets = "  ".join(f"{label}:{n}" for label, n in s["buckets"].items() if n)
+            lines.append(f"  {phase:<{width}}  n={s['count']:<3} mean={s['mean']:.2f}s "
+                         f"p50={s['p50']:.2f}s p90={s['p90']:.2f}s max={s['max']:.2f}s  [{buckets}]")
+        return "\n".join(lines)
+
+    def __bool__(self):
+        return bool(self.samples)
@@ -12,7 +12,8 @@ Usage (via bin/rf):
     rf run --resume
     rf run --from tags --until submit
     rf run --only eval
-    rf status
+    rf run --entries 0-11 --jobs 4        # many prompts_data.json entries at once
+    rf status [--entry N]
     rf list --playlist "NeilPop" [--not-generated] [--search "zula"]
     rf credits
 """
@@ -22,7 +23,10 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -30,6 +34,14 @@ BASE_DIR = Path(__file__).parent.parent
 PROMPTS_FILE = BASE_DIR / "prompts_data.json"
 TRACKING_FILE = BASE_DIR / "generated_tracks.json"
 PLAYLIST_CACHE_FILE = BASE_DIR / ".refrakt" / "caches" / "playlist.json"
+LOG_DIR = BASE_DIR / ".refrakt" / "logs"
+BATCH_JOBS = 4  # tracks whose CLI stages may run at once in a batch
+
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from suno_browser import daemon_available
 
 WIP_DIR = Path(os.path.expanduser(os.getenv("WIP_DIR", "~/Google Drive/My Drive/SunoTemp/")))
 OUT_DIR = Path(os.path.expanduser(os.getenv("OUT_DIR", "~/Downloads")))
@@ -54,6 +66,14 @@ AGENT_STAGES = {"lyrics", "lyrics-review", "tags", "title", "art"}
 # Stages that auto-execute via subprocess
 CLI_STAGES = {"select", "submit", "pick", "tag", "check"}
 
+# Batch runs: one lock per shared resource. Without the suno-browser service,
+# every `suno submit` opens the same persistent browser profile, so submits
+# from different tracks must take turns (the service queues them itself).
+_submit_lock = threading.Lock()
+_prompts_lock = threading.Lock()  # read-modify-write of prompts_data.json
+_print_lock = threading.Lock()
+_stage_ctx = threading.local()    # .batch / .log (per-entry subprocess log) while running a batch entry
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -93,26 +113,47 @@ def set_pipeline(entry, pipeline):
     entry["_pipeline"] = pipeline
 
 
-def mark_stage(entry, stage, status, extra=None):
-    """Update pipeline state for a stage. Saves to prompts_data.json."""
+def mark_stage(entry, stage, status, extra=None, index=0):
+    """Update pipeline state for a stage of entry `index`. Saves to prompts_data.json.
+
+    Only that entry's _pipeline is written back, so concurrent stages of other
+    entries (and agent edits to this entry's fields) are not overwritten.
+    """
     pipeline = get_pipeline(entry)
     pipeline[stage] = {"status": status, "at": now_iso()}
     if extra:
         pipeline[stage].update(extra)
     set_pipeline(entry, pipeline)
 
-    prompts = load_prompts()
-    if not prompts:
-        print("WARNING: prompts_data.json is empty; stage state not persisted", file=sys.stderr)
-        return
-    prompts[0] = entry
-    save_prompts(prompts)
+    with _prompts_lock:
+        prompts = load_prompts()
+        if len(prompts) <= index:
+            print(f"WARNING: prompts_data.json has no entry {index}; stage state not persisted",
+                  file=sys.stderr)
+            return
+        prompts[index]["_pipeline"] = pipeline
+        save_prompts(prompts)
+
+
+def load_entry(index):
+    with _prompts_lock:
+        prompts = load_prompts()
+    return prompts[index] if index < len(prompts) else None
 
 
 def run_bin(script, *args, check=True):
-    """Run a bin/ script, returning CompletedProcess."""
+    """Run a bin/ script, returning CompletedProcess.
+
+    In a batch run the output goes to the entry's log file instead of the terminal.
+    """
     cmd = [sys.executable, str(BASE_DIR / "bin" / script)] + list(args)
-    return subprocess.run(cmd, cwd=str(BASE_DIR), check=check)
+    log_path = getattr(_stage_ctx, "log", None)
+    if not log_path:
+        return subprocess.run(cmd, cwd=str(BASE_DIR), check=check)
+    with open(log_path, "a") as log:
+        log.write(f"\n$ bin/{script} {' '.join(args)}\n")
+        log.flush()
+        return subprocess.run(cmd, cwd=str(BASE_DIR), check=check, stdout=log, stderr=subprocess.STDOUT)
 
 
 def sanitize_filename(name):
@@ -180,26 +221,34 @@ def stage_icon(status):
     return icons.get(status, "?")
 
 
-def print_stage(name, status, detail=""):
+def print_stage(name, status, detail="", label=""):
     icon = stage_icon(status)
     status_str = status.ljust(7)
     detail_str = f" \u2014 {detail}" if detail else ""
-    print(f"  {icon} {name:<14} {status_str}{detail_str}")
+    with _print_lock:
+        print(f"  {label}{icon} {name:<14} {status_str}{detail_str}", flush=True)
 
 
-def print_agent_instruction(stage, agent_file, prompt_text):
+def print_agent_instruction(stage, agent_file, prompt_text, index=0):
     """Print instructions for Claude to spawn an agent."""
-    print(f"\n  \u2192 AGENT: Spawn {stage} agent (Haiku)")
-    print(f"    Agent file: .claude/agents/{agent_file}")
-    print(f"    Prompt: \"{prompt_text}\"")
-    print(f"    Resume: rf run --resume   (after agent completes)")
+    batch = getattr(_stage_ctx, "batch", False)
+    resume = f"rf run --entries {index}" if batch else "rf run --resume"
+    with _print_lock:
+        print(f"\n  \u2192 AGENT: Spawn {stage} agent (Haiku)" + (f" for entry {index}" if batch else ""))
+        print(f"    Agent file: .claude/agents/{agent_file}")
+        print(f"    Prompt: \"{prompt_text}\"")
+        print(f"    Resume: {resume}   (after agent completes)")
 
 
 # ---------------------------------------------------------------------------
 # Stage runners
 # ---------------------------------------------------------------------------
 
-def run_select(entry, args):
+def _agent_target(index):
+    return f"entry {index} of prompts_data.json" if getattr(_stage_ctx, "batch", False) else "prompts_data.json"
+
+
+def run_select(entry, args, index=0):
     """Stage 1: Pick track, fetch lyrics, research, write prompts_data.json."""
     cmd_args = ["--playlist", args.playlist]
     if args.track:
@@ -229,65 +278,96 @@ def run_select(entry, args):
     return f"{source} \u2192 {title}"
 
 
-def run_lyrics(entry, args):
+def run_lyrics(entry, args, index=0):
     """Stage 2: Spawn lyricist agent."""
     print_agent_instruction(
         "lyrics",
         "lyricist.md",
-        "Read .claude/agents/lyricist.md for instructions, then process prompts_data.json",
+        f"Read .claude/agents/lyricist.md for instructions, then process {_agent_target(index)}",
+        index,
     )
     return "awaiting agent"
 
 
-def run_lyrics_review(entry, args):
+def run_lyrics_review(entry, args, index=0):
     """Stage 3: Spawn lyrics-critic agent."""
     print_agent_instruction(
         "lyrics-review",
         "lyrics-critic.md",
-        "Read .claude/agents/lyrics-critic.md for instructions, then process prompts_data.json",
+        f"Read .claude/agents/lyrics-critic.md for instructions, then process {_agent_target(index)}",
+        index,
     )
     return "awaiting agent"
 
 
-def run_tags(entry, args):
+def run_tags(entry, args, index=0):
     """Stage 4: Spawn producer agent."""
     print_agent_instruction(
         "tags",
         "producer.md",
-        "Read .claude/agents/producer.md for instructions, then process prompts_data.json",
+        f"Read .claude/agents/producer.md for instructions, then process {_agent_target(index)}",
+        index,
     )
     return "awaiting agent"
 
 
-def run_title(entry, args):
+def run_title(entry, args, index=0):
     """Stage 5: Spawn title-designer + title-critic agents."""
     print_agent_instruction(
         "title",
         "title-designer.md",
-        "Read .claude/agents/title-designer.md for instructions, then process prompts_data.json",
+        f"Read .claude/agents/title-designer.md for instructions, then process {_agent_target(index)}",
+        index,
     )
-    print(f"\n    Then spawn title-critic:")
-    print(f"    Agent file: .claude/agents/title-critic.md")
-    print(f'    Prompt: "Read .claude/agents/title-critic.md for instructions, then process prompts_data.json"')
+    with _print_lock:
+        print(f"\n    Then spawn title-critic:")
+        print(f"    Agent file: .claude/agents/title-critic.md")
+        print(f'    Prompt: "Read .claude/agents/title-critic.md for instructions, then process {_agent_target(index)}"')
     return "awaiting agent"
 
 
-def run_art(entry, args):
+def run_art(entry, args, index=0):
     """Stage 6: Spawn artist agent (can run in background)."""
     print_agent_instruction(
         "art",
         "artist.md",
-        "Read .claude/agents/artist.md for instructions. Generate album art for the track at index 0.",
+        f"Read .claude/agents/artist.md for instructions. Generate album art for the track at index {index}.",
+        index,
     )
-    print(f"    Tip: spawn with run_in_background=true")
+    with _print_lock:
+        print(f"    Tip: spawn with run_in_background=true")
     return "awaiting agent"
 
 
-def run_submit(entry, args):
-    """Stage 7: Submit to Suno via browser automation."""
-    result = run_bin("suno", "submit", "--index", "0", check=False)
-    if result.returncode != 0:
-        raise RuntimeError(f"bin/suno submit exited with code {result.returncode}")
+def run_submit(entry, args, index=0):
+    """Stage 7: Submit to Suno via browser automation, then download the clips.
+
+    Without the suno-browser service only the browser submit holds _submit_lock;
+    waiting for renders and downloading run outside it so other tracks can submit.
+    """
+    fd, ids_file = tempfile.mkstemp(prefix="suno_ids_", suffix=".json")
+    os.close(fd)
+    try:
+        submit_args = ("submit", "--index", str(index), "--no-download", "--ids-file", ids_file)
+        if daemon_available():
+            result = run_bin("suno", *submit_args, check=False)
+        else:
+            with _submit_lock:
+                result = run_bin("suno", *submit_args, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"bin/suno submit exited with code {result.returncode}")
+        try:
+            with open(ids_file) as f:
+                clip_ids = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            clip_ids = []
+    finally:
+        os.unlink(ids_file)
+
+    if clip_ids:
+        result = run_bin("suno", "download", *clip_ids, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"bin/suno download exited with code {result.returncode}")
 
     # Count WIP candidates
     import glob as _glob
@@ -298,9 +378,9 @@ def run_submit(entry, args):
     return f"{len(candidates)} clips"
 
 
-def run_pick(entry, args):
+def run_pick(entry, args, index=0):
     """Stage 8: Gemini eval, copy winner to OUT_DIR."""
-    result = run_bin("suno", "pick", "--index", "0", check=False)
+    result = run_bin("suno", "pick", "--index", str(index), check=False)
     if result.returncode != 0:
         raise RuntimeError(f"bin/suno pick exited with code {result.returncode}")
 
@@ -314,7 +394,7 @@ def run_pick(entry, args):
     return "completed"
 
 
-def run_tag(entry, args):
+def run_tag(entry, args, index=0):
     """Stage 9: Embed cover art into winner M4A."""
     title = entry.get("invented_title", "")
     safe_title = sanitize_filename(title)
@@ -390,9 +470,9 @@ def run_tag(entry, args):
         raise RuntimeError(f"Failed to embed cover: {e}")
 
 
-def run_check(entry, args):
+def run_check(entry, args, index=0):
     """Stage 10: Validate all completion criteria."""
-    result = run_bin("refrakt", "check", "--index", "0", check=False)
+    result = run_bin("refrakt", "check", "--index", str(index), check=False)
     if result.returncode != 0:
         raise RuntimeError("Completion check failed (some steps incomplete)")
     return "ALL CLEAR"
@@ -417,7 +497,7 @@ STAGE_FUNCS = {
 # Pipeline control
 # ---------------------------------------------------------------------------
 
-def should_skip(name, pipeline, entry, args):
+def should_skip(name, pipeline, entry, args, index=0):
     """Determine if a stage should be skipped."""
     # --only: skip everything except the named stage
     if args.only and name != args.only:
@@ -446,12 +526,77 @@ def should_skip(name, pipeline, entry, args):
         # already reflected in the data, mark it done and skip
         if stage_info.get("status") == "running" and name in AGENT_STAGES:
             if agent_stage_completed(name, entry):
-                mark_stage(entry, name, "done", {"auto_advanced": True})
+                mark_stage(entry, name, "done", {"auto_advanced": True}, index=index)
                 return True
 
     return False
 
 
+def _run_stages(index, entry, args, label=""):
+    """Run the pipeline stages for one entry. Returns (outcome, entry).
+
+    outcome is "complete", "paused" (an agent stage was handed off) or
+    "failed" (a stage failed and --continue-on-error was not given).
+    """
+    pipeline = get_pipeline(entry)
+    for name in STAGE_NAMES:
+        if should_skip(name, pipeline, entry, args, index):
+            stage_info = pipeline.get(name, {})
+            if stage_info.get("status") == "done":
+                detail = _summarize_done_stage(name, entry, stage_info)
+                print_stage(name, "done", detail, label)
+            else:
+                print_stage(name, "skip", "", label)
+            continue
+
+        if args.dry_run:
+            if name in AGENT_STAGES:
+                print_stage(name, "pending", f"would spawn agent", label)
+            else:
+                print_stage(name, "pending", f"would execute", label)
+            continue
+
+        # Execute the stage
+        t0 = time.time()
+        fn = STAGE_FUNCS[name]
+
+        # Agent stages: mark as running, print instructions, and pause
+        if name in AGENT_STAGES:
+            mark_stage(entry, name, "running", index=index)
+            print_stage(name, "running", "", label)
+            try:
+                fn(entry, args, index)
+            except Exception as e:
+                mark_stage(entry, name, "failed", {"error": str(e)}, index=index)
+                print_stage(name, "failed", str(e), label)
+                return "failed", entry
+
+            # Agent stages pause here — Claude will spawn the agent
+            # and then resume with `rf run --resume`
+            return "paused", entry
+
+        # CLI stages: auto-execute
+        mark_stage(entry, name, "running", index=index)
+        print_stage(name, "running", "", label)
+        try:
+            result = fn(entry, args, index)
+            elapsed = time.time() - t0
+            mark_stage(entry, name, "done", {"elapsed": round(elapsed, 1)}, index=index)
+
+            # Reload entry in case the stage modified prompts_data.json
+            entry = load_entry(index) or entry
+            pipeline = get_pipeline(entry)
+
+            print_stage(name, "done", f"({fmt_duration(elapsed)}) {result or ''}", label)
+        except Exception as e:
+            elapsed = time.time() - t0
+            mark_stage(entry, name, "failed", {"error": str(e), "elapsed": round(elapsed, 1)}, index=index)
+            print_stage(name, "failed", str(e), label)
+            if not args.continue_on_error:
+                return "failed", entry
+    return "complete", entry
+
+
 def cmd_run(args):
     """Execute the pipeline."""
     # Validate stage names in --from/--until/--only
@@ -461,6 +606,10 @@ def cmd_run(args):
             print(f"Valid stages: {', '.join(STAGE_NAMES)}", file=sys.stderr)
             sys.exit(1)
 
+    if args.entries:
+        cmd_run_batch(args)
+        return
+
     # Resume mode: load existing entry
     if args.resume:
         prompts = load_prompts()
@@ -475,8 +624,6 @@ def cmd_run(args):
             sys.exit(1)
         entry = {}
 
-    pipeline = get_pipeline(entry)
-
     # Print header
     title = entry.get("invented_title", "(pending)")
     source = entry.get("source_track_name", "")
@@ -493,66 +640,13 @@ def cmd_run(args):
     if args.dry_run:
         print("  [DRY RUN \u2014 no actions will be taken]\n")
 
-    # Execute stages
-    for name in STAGE_NAMES:
-        if should_skip(name, pipeline, entry, args):
-            stage_info = pipeline.get(name, {})
-            if stage_info.get("status") == "done":
-                detail = _summarize_done_stage(name, entry, stage_info)
-                print_stage(name, "done", detail)
-            else:
-                print_stage(name, "skip")
-            continue
-
-        if args.dry_run:
-            if name in AGENT_STAGES:
-                print_stage(name, "pending", f"would spawn agent")
-            else:
-                print_stage(name, "pending", f"would execute")
-            continue
-
-        # Execute the stage
-        t0 = time.time()
-        fn = STAGE_FUNCS[name]
-
-        # Agent stages: mark as running, print instructions, and pause
-        if name in AGENT_STAGES:
-            mark_stage(entry, name, "running")
-            print_stage(name, "running", "")
-            try:
-                result = fn(entry, args)
-            except Exception as e:
-                mark_stage(entry, name, "failed", {"error": str(e)})
-                print_stage(name, "failed", str(e))
-                sys.exit(1)
-
-            # Agent stages pause here — Claude will spawn the agent
-            # and then resume with `rf run --resume`
-            elapsed = time.time() - t0
-            print(f"\n  Pipeline paused. Run 'rf run --resume' after agent completes.")
-            sys.exit(0)
-
-        # CLI stages: auto-execute
-        mark_stage(entry, name, "running")
-        print_stage(name, "running", "")
-        try:
-            result = fn(entry, args)
-            elapsed = time.time() - t0
-            mark_stage(entry, name, "done", {"elapsed": round(elapsed, 1)})
-
-            # Reload entry in case the stage modified prompts_data.json
-            prompts = load_prompts()
-            if prompts:
-                entry = prompts[0]
-
-            print_stage(name, "done", f"({fmt_duration(elapsed)}) {result or ''}")
-        except Exception as e:
-            elapsed = time.time() - t0
-            mark_stage(entry, name, "failed", {"error": str(e), "elapsed": round(elapsed, 1)})
-            print_stage(name, "failed", str(e))
-            if not args.continue_on_error:
-                print(f"\n  Pipeline stopped. Fix the issue and run 'rf run --resume'.")
-                sys.exit(1)
+    outcome, entry = _run_stages(0, entry, args)
+    if outcome == "paused":
+        print(f"\n  Pipeline paused. Run 'rf run --resume' after agent completes.")
+        sys.exit(0)
+    if outcome == "failed":
+        print(f"\n  Pipeline stopped. Fix the issue and run 'rf run --resume'.")
+        sys.exit(1)
 
     # All stages complete
     title = entry.get("invented_title", "?")
@@ -560,6 +654,82 @@ def cmd_run(args):
     print(f"\nPipeline complete. Output: {OUT_DIR}/{today}/{title}.*")
 
 
+def _run_entry(index, args):
+    """Batch worker: run one entry's stages with its subprocess output in its own log."""
+    entry = load_entry(index)
+    label = f"[{index}] "
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    _stage_ctx.batch = True
+    _stage_ctx.log = LOG_DIR / f"rf-entry-{index}.log"
+    try:
+        # Entries already exist, so select is never re-run for them
+        if get_pipeline(entry).get("select", {}).get("status") != "done" and not args.dry_run:
+            mark_stage(entry, "select", "done", {"batch": True}, index=index)
+        return _run_stages(index, entry, args, label)
+    except Exception as e:
+        print_stage("pipeline", "failed", str(e), label)
+        return "failed", entry
+    finally:
+        _stage_ctx.batch = False
+        _stage_ctx.log = None
+
+
+def cmd_run_batch(args):
+    """Run the pipeline for many prompts_data.json entries at once.
+
+    Each entry runs in its own worker (up to --jobs at a time), so CLI stages
+    of different tracks overlap: one track can be picked while another is
+    submitting. When an entry reaches an agent stage its instructions are
+    printed immediately and the worker moves on, so agents for several
+    tracks can be spawned while the rest of the batch keeps running. Done
+    stages are always skipped, so re-running the same command resumes.
+    """
+    prompts = load_prompts()
+    if not prompts:
+        print("ERROR: prompts_data.json has no entries", file=sys.stderr)
+        sys.exit(1)
+    from suno import parse_indexes
+    try:
+        indexes = parse_indexes(args.entries, len(prompts))
+    except ValueError:
+        print(f"ERROR: bad --entries {args.entries!r} (expected all or e.g. 0,2,5-7)", file=sys.stderr)
+        sys.exit(1)
+    bad = [i for i in indexes if i < 0 or i >= len(prompts)]
+    if bad:
+        print(f"ERROR: entry {bad[0]} out of range (0-{len(prompts) - 1})", file=sys.stderr)
+        sys.exit(1)
+    args.resume = True
+
+    header = f"Pipeline batch: {len(indexes)} entries, {args.jobs} at a time"
+    print(f"\n{header}")
+    print(f"\u2500" * min(len(header), 70))
+    for i in indexes:
+        print(f"  [{i}] {prompts[i].get('invented_title', '(untitled)')}")
+    print(f"  Logs: {LOG_DIR}/rf-entry-N.log\n")
+    if args.dry_run:
+        print("  [DRY RUN \u2014 no actions will be taken]\n")
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs), thread_name_prefix="rf") as pool:
+        futures = {pool.submit(_run_entry, i, args): i for i in indexes}
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+
+    print(f"\n{'=' * 60}")
+    for i in indexes:
+        outcome, entry = outcomes[i]
+        title = (entry or {}).get("invented_title", "?")
+        print(f"  [{i}] {outcome:<9} {title}")
+    paused = [i for i in indexes if outcomes[i][0] == "paused"]
+    failed = [i for i in indexes if outcomes[i][0] == "failed"]
+    print(f"{'=' * 60}")
+    if paused or failed:
+        waiting = ",".join(str(i) for i in paused + failed)
+        print(f"\n  Resume with 'rf run --entries {waiting}' after agents complete / issues are fixed.")
+    if failed:
+        sys.exit(1)
+
+
 def _summarize_done_stage(name, entry, stage_info):
     """Generate a short summary for a completed stage."""
     elapsed = stage_info.get("elapsed")
@@ -604,6 +774,34 @@ def _summarize_done_stage(name, entry, stage_info):
 # rf status
 # ---------------------------------------------------------------------------
 
+def _next_stage(pipeline):
+    """(stage, status) of the first stage that is not done, or (None, None)."""
+    for name in STAGE_NAMES:
+        status = pipeline.get(name, {}).get("status", "pending")
+        if status != "done":
+            return name, status
+    return None, None
+
+
+def _print_status_table(prompts):
+    """One row per entry: a status icon per stage plus the next stage."""
+    print(f"\n{len(prompts)} entries  (stages: {' '.join(STAGE_NAMES)})")
+    print("\u2500" * 66)
+    for i, entry in enumerate(prompts):
+        pipeline = get_pipeline(entry)
+        icons = "".join(stage_icon(pipeline.get(n, {}).get("status", "pending")) for n in STAGE_NAMES)
+        name, status = _next_stage(pipeline)
+        if name is None:
+            state = "complete"
+        elif status == "running":
+            state = f"{name} (in progress)"
+        else:
+            state = f"next: {name}"
+        title = entry.get("invented_title", "(untitled)")[:30]
+        print(f"  {i:<3} {title:<30} {icons}  {state}")
+    print(f"\n  Details: rf status --entry N")
+
+
 def cmd_status(args):
     """Show current pipeline state."""
     prompts = load_prompts()
@@ -611,7 +809,15 @@ def cmd_status(args):
         print("No active pipeline. Run 'rf run --playlist ... --track ...' to start.")
         return
 
-    entry = prompts[0]
+    if args.entry is None and len(prompts) > 1:
+        _print_status_table(prompts)
+        return
+    index = args.entry or 0
+    if index < 0 or index >= len(prompts):
+        print(f"ERROR: entry {index} out of range (0-{len(prompts) - 1})", file=sys.stderr)
+        sys.exit(1)
+
+    entry = prompts[index]
     pipeline = get_pipeline(entry)
     title = entry.get("invented_title", "(untitled)")
     source = entry.get("source_track_name", "?")
@@ -635,15 +841,11 @@ def cmd_status(args):
         today = datetime.now().strftime("%Y-%m-%d")
         print(f"  Output: {OUT_DIR}/{today}/{title}.*")
     else:
-        # Find next stage
-        for name in STAGE_NAMES:
-            status = pipeline.get(name, {}).get("status", "pending")
-            if status != "done":
-                if status == "running":
-                    print(f"  Current: {name} (in progress)")
-                else:
-                    print(f"  Next: {name}")
-                break
+        name, status = _next_stage(pipeline)
+        if status == "running":
+            print(f"  Current: {name} (in progress)")
+        else:
+            print(f"  Next: {name}")
 
 
 # ---------------------------------------------------------------------------
@@ -769,10 +971,16 @@ def build_parser():
     p_run.add_argument("--dry-run", action="store_true", help="Show what would happen")
     p_run.add_argument("--continue-on-error", action="store_true",
                         help="Continue to next stage even if one fails")
+    p_run.add_argument("--entries", type=str, default=None, metavar="SPEC",
+                        help="Run existing prompts_data.json entries concurrently: all, or e.g. 0,2,5-7")
+    p_run.add_argument("--jobs", type=int, default=BATCH_JOBS,
+                        help=f"Entries processed at once with --entries (default: {BATCH_JOBS})")
     p_run.set_defaults(func=cmd_run)
 
     # rf status
     p_status = sub.add_parser("status", help="Show current pipeline state")
+    p_status.add_argument("--entry", type=int, default=None,
+                          help="Show one entry in detail (default: table of all entries)")
     p_status.set_defaults(func=cmd_status)
 
     # rf list
@@ -13,6 +13,8 @@ Commands:
     feed [--page N]       List recent clips (default page 0)
     poll <clip_id> ...    Poll clip status until complete (or show current status)
     download <clip_id>... Download completed clips to output/ (.m4a, Opus ~143kbps)
+    transcode [dir]       Retro-transcode .m4a files whose .mp3 is missing or stale
+    queue [--indexes ...] Submit many prompts, keeping Suno's generation slots full
     session-save          Re-extract session tokens from the Playwright browser
                           (requires a logged-in headed session)
 
@@ -23,17 +25,19 @@ Audio note:
 """
 
 import argparse
+import base64
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
 # ---------------------------------------------------------------------------
@@ -44,10 +48,29 @@ _BASE_DIR = Path(__file__).parent.parent
 load_dotenv(_BASE_DIR / ".env")
 
 SESSION_FILE = str(_BASE_DIR / ".refrakt" / "suno_session.json")
+JWT_CACHE_FILE = _BASE_DIR / ".refrakt" / "suno_jwt.json"
+JWT_REFRESH_MARGIN = 15  # seconds before expiry to mint a new JWT
 OUTPUT_DIR = os.path.expanduser(os.getenv("WIP_DIR", "~/Google Drive/My Drive/SunoTemp/"))
 AUTH_BASE = "https://auth.suno.com"
 API_BASE = "https://studio-api.prod.suno.com"
 CDN_BASE = "https://cdn1.suno.ai"
+DOWNLOAD_WORKERS = int(os.getenv("SUNO_DOWNLOAD_WORKERS", "4"))
+DOWNLOAD_RETRIES = 4  # resume attempts per file after a dropped connection
+
+# Completion polling: start fast, back off while nothing changes, snap back on progress
+POLL_INITIAL_INTERVAL = 2.0
+POLL_MAX_INTERVAL = 15.0
+POLL_BACKOFF = 1.5
+
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+import http_client
+from clip_store import ClipStore
+from phase_timing import PhaseTimings
+from transcode import TranscodeService, transcode_directory
 
 
 # ---------------------------------------------------------------------------
@@ -63,83 +86,177 @@ def load_session() -> dict:
 
 def refresh_jwt(session: dict) -> str:
     """Exchange the long-lived __client token for a fresh short-lived JWT (~60s TTL)."""
-    r = requests.post(
+    r = http_client.post(
         f"{AUTH_BASE}/v1/client/sessions/{session['session_id']}/tokens",
         headers={
             "Cookie": f"__client={session['client_token']}",
             "Origin": "https://suno.com",
         },
         params={"_clerk_js_version": "5.36.2"},
+        retry_unsafe=True,  # minting a token is safe to repeat
     )
     r.raise_for_status()
     return r.json()["jwt"]
 
 
-def get_auth_headers(session: dict, jwt: str) -> dict:
+def _jwt_expiry(jwt: str) -> float:
+    """Read the exp claim from a JWT (no signature check). Falls back to ~50s from now."""
+    try:
+        payload = jwt.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return time.time() + 50
+
+
+class JWTManager:
+    """Caches the short-lived Suno JWT and re-mints it shortly before it expires.
+
+    Pass a JWTManager wherever an API call takes `jwt`; each request gets a
+    token valid for at least JWT_REFRESH_MARGIN seconds, and a 401 invalidates
+    it and retries once. The token is shared across CLI invocations via
+    .refrakt/suno_jwt.json while it stays valid.
+    """
+
+    def __init__(self, session: dict):
+        self.session = session
+        self.lock = threading.Lock()
+        self._jwt, self._expires = None, 0.0
+        try:
+            with open(JWT_CACHE_FILE) as f:
+                cached = json.load(f)
+            if cached.get("session_id") == session.get("session_id"):
+                self._jwt, self._expires = cached["jwt"], float(cached["expires"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def token(self) -> str:
+        with self.lock:
+            if self._jwt is None or self._expires - time.time() < JWT_REFRESH_MARGIN:
+                self._jwt = refresh_jwt(self.session)
+                self._expires = _jwt_expiry(self._jwt)
+                self._save()
+            return self._jwt
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self._jwt, self._expires = None, 0.0
+
+    def _save(self) -> None:
+        try:
+            JWT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(JWT_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"session_id": self.session.get("session_id"),
+                           "jwt": self._jwt, "expires": self._expires}, f)
+        except OSError:
+            pass
+
+    def __str__(self) -> str:
+        return self.token()
+
+
+def get_auth_headers(session: dict, jwt) -> dict:
+    """Auth headers for studio-api. jwt is a raw token string or a JWTManager."""
+    token = jwt.token() if isinstance(jwt, JWTManager) else jwt
     return {
-        "Authorization": f"Bearer {jwt}",
+        "Authorization": f"Bearer {token}",
         "Cookie": f"sessionid={session['django_session_id']}",
     }
 
 
+def _api_get(session: dict, jwt, url: str, **kwargs):
+    """Authenticated GET; with a JWTManager a 401 re-mints the token and retries once."""
+    r = http_client.get(url, headers=get_auth_headers(session, jwt), **kwargs)
+    if r.status_code == 401 and isinstance(jwt, JWTManager):
+        jwt.invalidate()
+        r = http_client.get(url, headers=get_auth_headers(session, jwt), **kwargs)
+    r.raise_for_status()
+    return r
+
+
 # ---------------------------------------------------------------------------
 # API calls
 # ---------------------------------------------------------------------------
 
 def get_session_info(session: dict, jwt: str) -> dict:
     """Fetch /api/session/ — user info, subscription, credits."""
-    r = requests.get(
-        f"{API_BASE}/api/session/",
-        headers=get_auth_headers(session, jwt),
-    )
-    r.raise_for_status()
-    return r.json()
+    return _api_get(session, jwt, f"{API_BASE}/api/session/").json()
 
 
 def get_billing_info(session: dict, jwt: str) -> dict:
     """Fetch /api/billing/info/ — credit balance."""
-    r = requests.get(
-        f"{API_BASE}/api/billing/info/",
-        headers=get_auth_headers(session, jwt),
-    )
-    r.raise_for_status()
-    return r.json()
+    return _api_get(session, jwt, f"{API_BASE}/api/billing/info/").json()
+
+
+def credits_remaining(billing: dict) -> int | None:
+    """Credits left according to a /api/billing/info/ response (None if the field is missing)."""
+    credits_left = billing.get("total_credits_left")
+    if credits_left is None:
+        credits_left = billing.get("credits_left")
+    return credits_left
 
 
 def get_feed(session: dict, jwt: str, page: int = 0) -> list:
     """Fetch the user's clip feed."""
-    r = requests.get(
-        f"{API_BASE}/api/feed/",
-        headers=get_auth_headers(session, jwt),
-        params={"page": page},
-    )
-    r.raise_for_status()
-    return r.json()
+    return _api_get(session, jwt, f"{API_BASE}/api/feed/", params={"page": page}).json()
+
+
+def sync_feed(session: dict, jwt, store: ClipStore | None = None) -> list[str]:
+    """Incrementally mirror the feed into the local clip store. Returns newly seen clip IDs."""
+    store = store or ClipStore()
+    return store.sync(lambda page: get_feed(session, jwt, page=page))
 
 
 def poll_clips(session: dict, jwt: str, clip_ids: list) -> list:
     """Fetch status of specific clip IDs."""
     ids_param = ",".join(clip_ids)
-    r = requests.get(
-        f"{API_BASE}/api/feed/?ids={ids_param}",
-        headers=get_auth_headers(session, jwt),
-    )
-    r.raise_for_status()
-    return r.json()
+    return _api_get(session, jwt, f"{API_BASE}/api/feed/?ids={ids_param}").json()
 
 
-def wait_for_completion(session: dict, jwt: str, clip_ids: list,
-                        timeout: int = 300, interval: int = 5) -> list:
-    """Poll until all clips are complete or errored."""
+def iter_finished_clips(poll, clip_ids: list, timeout: int = 300,
+                        initial_interval: float = POLL_INITIAL_INTERVAL,
+                        max_interval: float = POLL_MAX_INTERVAL):
+    """Yield each clip dict as soon as it reaches "complete" or "error".
+
+    poll(ids) returns the feed entries for the still-pending ids. The interval
+    starts at initial_interval and grows by POLL_BACKOFF after every poll with
+    no progress (capped at max_interval); any finished clip resets it, since
+    siblings from the same submission usually land close together.
+    Raises TimeoutError if clips are still pending after timeout seconds.
+    """
     deadline = time.time() + timeout
-    while time.time() < deadline:
-        clips = poll_clips(session, jwt, clip_ids)
-        pending = [c["id"] for c in clips if c["status"] not in ("complete", "error")]
+    pending = list(dict.fromkeys(clip_ids))
+    interval = initial_interval
+    last_report = None
+    while pending:
+        clips = poll(pending)
+        finished = [c for c in clips if c.get("status") in ("complete", "error")]
+        for clip in finished:
+            if clip["id"] in pending:
+                pending.remove(clip["id"])
+                yield clip
         if not pending:
-            return clips
-        print(f"  [{int(deadline - time.time())}s left] Waiting: {len(pending)} clip(s) still processing...")
-        time.sleep(interval)
-    raise TimeoutError(f"Clips not complete after {timeout}s")
+            return
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError(f"{len(pending)} clip(s) not complete after {timeout}s")
+        interval = initial_interval if finished else min(interval * POLL_BACKOFF, max_interval)
+        if len(pending) != last_report:
+            print(f"  [{int(remaining)}s left] Waiting: {len(pending)} clip(s) still processing...")
+            last_report = len(pending)
+        time.sleep(min(interval, remaining))
+
+
+def iter_completed(session: dict, jwt, clip_ids: list, timeout: int = 300):
+    """Yield clips from the feed as each one finishes. Pass a JWTManager for polls longer than the JWT TTL."""
+    yield from iter_finished_clips(lambda ids: poll_clips(session, jwt, ids), clip_ids, timeout)
+
+
+def wait_for_completion(session: dict, jwt, clip_ids: list, timeout: int = 300) -> list:
+    """Poll until all clips are complete or errored. Returns clips in clip_ids order."""
+    by_id = {c["id"]: c for c in iter_completed(session, jwt, clip_ids, timeout)}
+    return [by_id[cid] for cid in dict.fromkeys(clip_ids) if cid in by_id]
 
 
 # ---------------------------------------------------------------------------
@@ -151,36 +268,77 @@ def sanitize_filename(name: str) -> str:
     return name.strip().replace(" ", "_")
 
 
-def transcode_to_mp3(m4a_path: str, bitrate: str = "320k") -> str | None:
-    """Transcode .m4a (Opus) to .mp3 for Apple Music compatibility. Returns mp3 path or None."""
-    if not shutil.which("ffmpeg"):
+def check_truncation(audio_path: str) -> dict | None:
+    """Tail-only truncation check (audio_analysis.detect_truncation_fast). None if unavailable."""
+    try:
+        from audio_analysis import detect_truncation_fast
+    except ImportError:
         return None
-    mp3_path = str(Path(m4a_path).with_suffix(".mp3"))
     try:
-        result = subprocess.run(
-            ["ffmpeg", "-i", m4a_path, "-c:a", "libmp3lame", "-b:a", bitrate,
-             "-map_metadata", "0", "-id3v2_version", "3", "-y", mp3_path],
-            capture_output=True, text=True, timeout=60,
-        )
-        if os.path.exists(mp3_path) and os.path.getsize(mp3_path) > 0:
-            return mp3_path
-        print(f"  WARNING: ffmpeg exited {result.returncode}: {result.stderr[:200]}", file=sys.stderr)
-    except subprocess.TimeoutExpired:
-        print(f"  WARNING: ffmpeg transcode timed out for {m4a_path}", file=sys.stderr)
-    except OSError as e:
-        print(f"  WARNING: ffmpeg transcode failed: {e}", file=sys.stderr)
-    return None
-
-
-def download_file(url: str, dest_path: str) -> int:
-    """Stream-download url to dest_path. Returns file size in bytes."""
-    r = requests.get(url, stream=True)
-    r.raise_for_status()
+        return detect_truncation_fast(audio_path)
+    except Exception as e:
+        print(f"  WARNING: truncation check failed: {e}", file=sys.stderr)
+        return None
+
+
+def download_file(url: str, dest_path: str, retries: int = DOWNLOAD_RETRIES) -> int:
+    """Stream-download url to dest_path via a resumable .part file. Returns file size in bytes.
+
+    An existing dest_path + ".part" (from an interrupted run) is resumed with an
+    HTTP Range request; dropped connections resume the same way up to `retries`
+    times. The finished size is checked against Content-Length / Content-Range
+    before the .part is renamed into place.
+    """
     os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
-    with open(dest_path, "wb") as f:
-        for chunk in r.iter_content(chunk_size=65536):
-            f.write(chunk)
-    return os.path.getsize(dest_path)
+    part_path = dest_path + ".part"
+    expected = None
+    size = 0
+
+    for attempt in range(retries + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with http_client.get(url, stream=True, headers=headers,
+                                 timeout=http_client.DOWNLOAD_TIMEOUT) as r:
+                if r.status_code == 416:
+                    # Range past the end — the partial is stale or already complete; start over
+                    os.unlink(part_path)
+                    continue
+                r.raise_for_status()
+                if r.status_code == 206:
+                    m = re.search(r"/(\d+)$", r.headers.get("Content-Range", ""))
+                    expected = int(m.group(1)) if m else None
+                    mode = "ab"
+                else:
+                    # Server ignored the Range header — rewrite from the start
+                    length = r.headers.get("Content-Length")
+                    expected = int(length) if length and "Content-Encoding" not in r.headers else None
+                    mode = "wb"
+                with open(part_path, mode) as f:
+                    for chunk in r.iter_content(chunk_size=65536):
+                        f.write(chunk)
+        except OSError as e:  # requests' connection/timeout errors are OSErrors too
+            if getattr(e, "response", None) is not None and e.response.status_code < 500:
+                raise
+            if attempt == retries:
+                raise
+            time.sleep(min(2 ** attempt, 10))
+            continue
+
+        size = os.path.getsize(part_path)
+        if expected is None or size == expected:
+            os.replace(part_path, dest_path)
+            return size
+        if size > expected:
+            os.unlink(part_path)  # corrupt partial — refetch whole file
+    raise IOError(f"Incomplete download of {url}: got {size} of {expected} bytes")
+
+
+def _existing_partial(date_dir: str, clip_id: str) -> str | None:
+    """Return the dest path of an interrupted download of clip_id in date_dir, if any."""
+    import glob as _glob
+    parts = sorted(_glob.glob(os.path.join(_glob.escape(date_dir), f"*__{clip_id[:8]}.m4a.part")))
+    return parts[-1][:-len(".part")] if parts else None
 
 
 # ---------------------------------------------------------------------------
@@ -191,8 +349,9 @@ def cmd_auth(args):
     """Verify auth and show user/credit summary."""
     session = load_session()
     print("Refreshing JWT...")
-    jwt = refresh_jwt(session)
-    print("  OK — JWT refreshed.\n")
+    jwt = JWTManager(session)
+    jwt.token()
+    print("  OK — JWT valid.\n")
 
     info = get_session_info(session, jwt)
     print(f"User:         {info.get('display_name', '?')} (@{info.get('handle', '?')})")
@@ -216,9 +375,9 @@ def cmd_auth(args):
 def cmd_credits(args):
     """Show remaining credits."""
     session = load_session()
-    jwt = refresh_jwt(session)
+    jwt = JWTManager(session)
     billing = get_billing_info(session, jwt)
-    credits_left = billing.get("total_credits_left") or billing.get("credits_left")
+    credits_left = credits_remaining(billing)
     if credits_left is not None:
         print(f"Credits remaining: {credits_left}")
     else:
@@ -228,12 +387,13 @@ def cmd_credits(args):
 def cmd_feed(args):
     """List recent clips from the user's feed."""
     session = load_session()
-    jwt = refresh_jwt(session)
+    jwt = JWTManager(session)
     page = getattr(args, "page", 0)
     clips = get_feed(session, jwt, page=page)
     if not clips:
         print("(No clips found)")
         return
+    ClipStore().upsert_many(clips)
     print(f"{'ID':36}  {'Status':12}  {'Title'}")
     print("-" * 80)
     for clip in clips:
@@ -246,7 +406,7 @@ def cmd_feed(args):
 def cmd_poll(args):
     """Poll clip status. Waits until complete if --wait is set."""
     session = load_session()
-    jwt = refresh_jwt(session)
+    jwt = JWTManager(session)
     clip_ids = args.clip_ids
 
     if getattr(args, "wait", False):
@@ -272,12 +432,9 @@ def cmd_poll(args):
 def cmd_download(args):
     """Download completed clips to output/ as .m4a (Opus ~143kbps) + .mp3 (320kbps) for Apple Music."""
     session = load_session()
-    jwt = refresh_jwt(session)
+    jwt = JWTManager(session)
     clip_ids = args.clip_ids
 
-    print(f"Polling {len(clip_ids)} clip(s)...")
-    clips = wait_for_completion(session, jwt, clip_ids)
-
     date_dir = os.path.join(OUTPUT_DIR, datetime.now().strftime("%Y-%m-%d"))
     os.makedirs(date_dir, exist_ok=True)
 
@@ -291,49 +448,124 @@ def cmd_download(args):
     except (OSError, json.JSONDecodeError):
         pass
 
-    for i, clip in enumerate(clips, start=1):
-        clip_id = clip["id"]
-        status = clip["status"]
-        title = clip.get("title", clip_id)
-        audio_url = clip.get("audio_url", "")
+    # Each clip is downloaded the moment it finishes rendering; each finished
+    # download goes straight to the tag/transcode stage, so network, ffmpeg and
+    # the remaining renders all overlap
+    position = {cid: n for n, cid in enumerate(dict.fromkeys(clip_ids), start=1)}
+    store = ClipStore()
+    print_lock = threading.Lock()
+    finishing, failed = [], []
 
-        if status == "error":
-            print(f"  [{i}] SKIPPED (error): {clip_id}")
-            continue
-        if not audio_url:
-            print(f"  [{i}] SKIPPED (no audio_url yet): {clip_id}")
-            continue
+    def _emit(lines):
+        with print_lock:
+            print("\n".join(lines))
 
-        # Use .m4a (Opus ~143kbps) rather than .mp3 (64kbps) from audio_url
-        m4a_url = f"{CDN_BASE}/{clip_id}.m4a"
-        safe_title = sanitize_filename(title)
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        filename = f"{timestamp}_{safe_title}__{clip_id[:8]}.m4a"
-        dest = os.path.join(date_dir, filename)
-
-        print(f"  [{i}] {title}")
-        print(f"       {m4a_url}")
-        print(f"       -> {dest}")
-        size = download_file(m4a_url, dest)
-        print(f"       Done ({size // 1024} KB)")
-
-        # Tag with metadata (match clip to prompt by title for album name)
+    def _on_fetched(future, i, clip, dest):
         try:
-            from tag_tracks import tag_file, match_prompt_to_clip
-            prompt_entry = match_prompt_to_clip(clip, prompts) if prompts else None
-            tag_file(dest, clip, prompt=prompt_entry)
-            print(f"       Tagged with metadata.")
+            size = future.result()
         except Exception as e:
-            print(f"       WARNING: Could not tag: {e}")
+            failed.append(clip["id"])
+            _emit([f"  [{i}] FAILED: {clip.get('title', clip['id'])}: {e}"])
+            return
+        store.set_local_path(clip["id"], dest)
+        post = post_pool.submit(_finish_download, i, clip, dest, size, prompts, transcoder)
+        post.add_done_callback(lambda f: _on_finished(f, i, clip))
+        finishing.append(post)
+
+    def _on_finished(future, i, clip):
+        try:
+            lines = future.result()
+        except Exception as e:
+            failed.append(clip["id"])
+            _emit([f"  [{i}] FAILED: {clip.get('title', clip['id'])}: {e}"])
+            return
+        _emit(lines)
+
+    print(f"Polling {len(position)} clip(s)...")
+    timed_out = None
+    with ThreadPoolExecutor(max_workers=max(1, DOWNLOAD_WORKERS)) as fetch_pool, \
+            ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as post_pool, \
+            TranscodeService() as transcoder:
+        try:
+            for clip in iter_completed(session, jwt, clip_ids):
+                clip_id = clip["id"]
+                store.upsert_many([clip])
+                i = position.get(clip_id, 0)
+                title = clip.get("title", clip_id)
+
+                if clip["status"] == "error":
+                    _emit([f"  [{i}] SKIPPED (error): {clip_id}"])
+                    continue
+                if not clip.get("audio_url"):
+                    _emit([f"  [{i}] SKIPPED (no audio_url yet): {clip_id}"])
+                    continue
+
+                # Resume an interrupted download under its original name, else start a new file
+                dest = _existing_partial(date_dir, clip_id)
+                if dest is None:
+                    safe_title = sanitize_filename(title)
+                    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+                    dest = os.path.join(date_dir, f"{timestamp}_{safe_title}__{clip_id[:8]}.m4a")
+
+                # Use .m4a (Opus ~143kbps) rather than .mp3 (64kbps) from audio_url
+                future = fetch_pool.submit(download_file, f"{CDN_BASE}/{clip_id}.m4a", dest)
+                future.add_done_callback(
+                    lambda f, i=i, clip=clip, dest=dest: _on_fetched(f, i, clip, dest))
+        except TimeoutError as e:
+            timed_out = e
+        fetch_pool.shutdown(wait=True)  # all done-callbacks have queued their post stage
+        wait(finishing)
+
+    if timed_out:
+        print(f"\nWARNING: {timed_out} — run download again later for the rest.")
+    if failed:
+        print(f"\n{len(failed)} download(s) failed — re-run to resume from the .part files.")
+    elif not timed_out:
+        print("\nAll downloads complete.")
+
+
+def _finish_download(i: int, clip: dict, dest: str, size: int, prompts: list,
+                     transcoder: TranscodeService) -> list[str]:
+    """Truncation check, tag and transcode one downloaded clip. Returns its report lines."""
+    lines = [
+        f"  [{i}] {clip.get('title', clip['id'])}",
+        f"       -> {dest}",
+        f"       Done ({size // 1024} KB)",
+    ]
 
-        # Transcode to MP3 for Apple Music compatibility
-        mp3_path = transcode_to_mp3(dest)
-        if mp3_path:
-            print(f"       Transcoded to MP3 ({os.path.getsize(mp3_path) // 1024} KB)")
-        else:
-            print(f"       WARNING: Could not transcode to MP3 (ffmpeg missing or failed)")
+    trunc = check_truncation(dest)
+    if trunc and trunc.get("truncated"):
+        lines.append(f"       WARNING: likely truncated at {trunc['duration_display']} "
+                     f"({trunc['reason']}, {trunc['confidence']:.0%})")
+
+    # Tag with metadata (match clip to prompt by title for album name)
+    try:
+        from tag_tracks import tag_file, match_prompt_to_clip
+        prompt_entry = match_prompt_to_clip(clip, prompts) if prompts else None
+        tag_file(dest, clip, prompt=prompt_entry)
+        lines.append(f"       Tagged with metadata.")
+    except Exception as e:
+        lines.append(f"       WARNING: Could not tag: {e}")
 
-    print("\nAll downloads complete.")
+    # Transcode to MP3 for Apple Music compatibility (after tagging — ffmpeg copies the tags)
+    mp3_path = transcoder.submit(dest).result()
+    if mp3_path:
+        lines.append(f"       Transcoded to MP3 ({os.path.getsize(mp3_path) // 1024} KB)")
+    else:
+        lines.append(f"       WARNING: Could not transcode to MP3 (ffmpeg missing or failed)")
+    return lines
+
+
+def cmd_transcode(args):
+    """Transcode every .m4a under a directory whose .mp3 is missing or older than the .m4a."""
+    directory = args.directory or OUTPUT_DIR
+    print(f"Transcoding stale MP3s under {directory}...")
+    summary = transcode_directory(directory, recursive=not args.no_recursive,
+                                  force=args.force, max_workers=args.workers)
+    print(f"\n{summary['transcoded']} transcoded, {summary['skipped']} up to date, "
+          f"{len(summary['failed'])} failed")
+    if summary["failed"]:
+        sys.exit(1)
 
 
 # ---------------------------------------------------------------------------
@@ -353,59 +585,60 @@ def pw(*args: str, timeout: int = 30) -> str:
     return result.stdout
 
 
-def _submit_one_variation(index: int, variation_label: str):
-    """Reload page, fill form, click Create for one prompt variation."""
-    pw("reload")
-    time.sleep(3)
-
-    # Fill form via suno-fill-form helper
-    fill_cmd = [
-        sys.executable, str(_BASE_DIR / "bin" / "suno-fill-form"),
-        "--index", str(index),
-    ]
-    fill = subprocess.run(fill_cmd, capture_output=True, text=True, timeout=30)
-    if fill.returncode != 0:
-        print(f"  ERROR filling form: {fill.stderr.strip()}", file=sys.stderr)
-        return False
-    print(f"  {variation_label}: Form filled")
-
-    time.sleep(2)
-
-    # Click Create
-    output = pw(
-        "run-code",
-        "async page => { await page.getByRole('button', { name: 'Create song' }).click(); return 'ok'; }",
-        timeout=15,
-    )
-    if "ok" not in output:
-        print(f"  ERROR clicking Create: {output}", file=sys.stderr)
+CLIPS_PER_SUBMISSION = 2  # Suno always renders a pair
+
+# Listener attached to the playwright Page (which persists across run-code calls
+# and reloads): records clip IDs from every generate response the page receives
+_CAPTURE_INSTALL_JS = r"""async page => {
+  if (!page.__refraktClipIds) {
+    page.__refraktClipIds = [];
+    page.on('response', async resp => {
+      if (resp.request().method() !== 'POST' || !/\/api\/generate\/v2(-web)?\//.test(resp.url())) return;
+      try {
+        const body = await resp.json();
+        for (const clip of (body.clips || [])) if (clip.id) page.__refraktClipIds.push(clip.id);
+      } catch (e) {}
+    });
+  }
+  return 'CAPTURE_READY';
+}"""
+_CAPTURE_COLLECT_JS = "async page => 'CLIP_IDS=' + (page.__refraktClipIds || []).splice(0).join(',')"
+
+
+def install_clip_capture(pw_fn=None) -> bool:
+    """Start recording clip IDs from Suno's generate responses in the open browser page."""
+    pw_fn = pw_fn or pw
+    try:
+        return "CAPTURE_READY" in pw_fn("run-code", _CAPTURE_INSTALL_JS, timeout=15)
+    except Exception as e:
+        print(f"  WARN: could not install clip capture: {e}", file=sys.stderr)
         return False
-    print(f"  {variation_label}: Create clicked")
-
-    time.sleep(5)
-    return True
 
 
-def cmd_submit(args):
-    """Open browser, submit 3 prompt variations, close browser."""
-    index = args.index
-    variations = args.variations
+def collect_captured_clip_ids(expected: int = 0, timeout: float = 15, pw_fn=None) -> list[str]:
+    """Drain captured clip IDs, waiting up to timeout for `expected` of them (late responses)."""
+    pw_fn = pw_fn or pw
+    ids = []
+    deadline = time.time() + timeout
+    while True:
+        try:
+            output = pw_fn("run-code", _CAPTURE_COLLECT_JS, timeout=15)
+        except Exception as e:
+            print(f"  WARN: could not read captured clip IDs: {e}", file=sys.stderr)
+            break
+        m = re.search(r"CLIP_IDS=([0-9a-fA-F,-]*)", output)
+        ids.extend(i for i in (m.group(1).split(",") if m else []) if i and i not in ids)
+        if len(ids) >= expected or time.time() >= deadline:
+            break
+        time.sleep(1)
+    return ids
 
-    # Load prompts
-    with open(PROMPTS_FILE) as f:
-        prompts = json.load(f)
-    if index < 0 or index >= len(prompts):
-        print(f"ERROR: index {index} out of range (0-{len(prompts) - 1})", file=sys.stderr)
-        sys.exit(1)
 
-    entry = prompts[index]
-    title = entry.get("invented_title", "(untitled)")
-    base_tags = entry.get("tags", "")
-    print(f"Submitting: {title}")
-    print(f"  Base tags: {base_tags[:80]}...")
-    print(f"  Variations: {variations}")
+def build_tag_variations(base_tags: str, variations: int = 3) -> list[str]:
+    """Build tag variations by rearranging tag order and tweaking BPM.
 
-    # Build tag variations by rearranging tag order and tweaking BPM
+    V1 = base (as-is), V2 = genre-led (+5 BPM), V3 = texture-led (-7 BPM).
+    """
     tag_parts = [t.strip() for t in base_tags.split(",")]
 
     # Extract BPM tag if present
@@ -419,12 +652,10 @@ def cmd_submit(args):
 
     bpm_val = None
     if bpm_tag:
-        import re as _re
-        m = _re.search(r"(\d+)", bpm_tag)
+        m = re.search(r"(\d+)", bpm_tag)
         if m:
             bpm_val = int(m.group(1))
 
-    # V1 = base (as-is), V2 = genre-led (+5 BPM), V3 = texture-led (-7 BPM)
     tag_variations = [base_tags]  # V1
     if variations >= 2 and len(other_tags) >= 4:
         # V2: move genre tags (typically index 3-4) to front
@@ -440,77 +671,246 @@ def cmd_submit(args):
         if v3_bpm:
             v3_tags.append(v3_bpm)
         tag_variations.append(", ".join(v3_tags))
+    return tag_variations
 
-    # Snapshot feed before
-    session = load_session()
-    jwt = refresh_jwt(session)
-    feed_before = {c["id"] for c in get_feed(session, jwt, page=0)}
 
-    # Open browser
+def _report_variations(tag_variations: list, results: list) -> tuple[int, set]:
+    """Print clip IDs per variation. Returns (successful, new clip IDs)."""
+    successful, new_ids = 0, set()
+    for i, var_tags in enumerate(tag_variations):
+        ids = results[i] if i < len(results) else []
+        print(f"\n  --- V{i + 1}: {var_tags[:70]}... ---")
+        if ids:
+            successful += 1
+            new_ids.update(ids)
+            print(f"  V{i + 1}: {', '.join(ids)}")
+        else:
+            print(f"  V{i + 1}: no clips", file=sys.stderr)
+    return successful, new_ids
+
+
+def _open_suno_page(session: dict, timings: PhaseTimings):
+    """Open the persistent browser on /create with the session cookies, ready to submit."""
+    from suno_browser import wait_until_ready
+
     print(f"\nOpening browser...")
-    pw("open", "--headed", "--persistent",
-       f"--profile={PROFILE_DIR}", "https://suno.com/create", timeout=15)
-    time.sleep(3)
-
-    # Inject cookies
-    client_token = session["client_token"]
-    django_session = session["django_session_id"]
-    pw("cookie-set", "__client", client_token,
-       "--domain=.suno.com", "--path=/", "--secure", "--httpOnly")
-    pw("cookie-set", "sessionid", django_session,
-       "--domain=.suno.com", "--path=/", "--secure", "--httpOnly")
-    pw("reload")
-    time.sleep(4)
-    print("  Cookies injected, page reloaded")
-
-    # Submit each variation
+    with timings.phase("open"):
+        pw("open", "--headed", "--persistent",
+           f"--profile={PROFILE_DIR}", "https://suno.com/create", timeout=15)
+        pw("cookie-set", "__client", session["client_token"],
+           "--domain=.suno.com", "--path=/", "--secure", "--httpOnly")
+        pw("cookie-set", "sessionid", session["django_session_id"],
+           "--domain=.suno.com", "--path=/", "--secure", "--httpOnly")
+        pw("reload")
+        wait_until_ready(pw)
+    print("  Cookies injected, page ready")
+    install_clip_capture()  # catches the generate response when a captcha delays it past submit_prompt
+
+
+def _submit_in_browser(entry: dict, tag_variations: list, session: dict, timings: PhaseTimings,
+                       reload_each: bool = False):
+    """Open a browser for this run and submit each variation. Returns (successful, new clip IDs)."""
+    from suno_browser import submit_prompt, submit_variations
+
+    _open_suno_page(session, timings)
+
+    if not reload_each:
+        # Single pass: fill once, then only overwrite Styles between Create clicks
+        try:
+            results = submit_variations(entry, tag_variations, pw, timings=timings, reload=False)
+        except Exception as e:
+            print(f"  ERROR: {e}", file=sys.stderr)
+            results = []
+        pw("close")
+        print("  Browser closed")
+        return _report_variations(tag_variations, results)
+
+    # Each variation is one run-code call: the page was just loaded, so only later ones reload
     successful = 0
+    new_ids = set()
     for i, var_tags in enumerate(tag_variations):
         label = f"V{i + 1}"
-
-        # Temporarily set variation tags
-        prompts[index]["tags"] = var_tags
-        with open(PROMPTS_FILE, "w") as f:
-            json.dump(prompts, f, indent=2, ensure_ascii=False)
-            f.write("\n")
-
         print(f"\n  --- {label}: {var_tags[:70]}... ---")
-        if _submit_one_variation(index, label):
-            successful += 1
-
-    # Restore base tags
-    prompts[index]["tags"] = base_tags
-    with open(PROMPTS_FILE, "w") as f:
-        json.dump(prompts, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    print(f"\n  Tags restored to base")
+        try:
+            ids = submit_prompt({**entry, "tags": var_tags}, pw, timings=timings, reload=i > 0)
+        except Exception as e:
+            print(f"  ERROR: {e}", file=sys.stderr)
+            continue
+        successful += 1
+        new_ids.update(ids)
+        print(f"  {label}: {', '.join(ids)}")
 
-    # Close browser
     pw("close")
     print("  Browser closed")
 
-    # Discover new clips
-    print(f"\nChecking feed for new clips...")
-    jwt = refresh_jwt(session)  # refresh in case it expired
-    time.sleep(3)
-    feed_after = {c["id"] for c in get_feed(session, jwt, page=0)}
-    new_ids = feed_after - feed_before
+    return successful, new_ids
+
+
+def cmd_submit(args):
+    """Open browser, submit 3 prompt variations, close browser."""
+    index = args.index
+    variations = args.variations
+
+    # Load prompts
+    with open(PROMPTS_FILE) as f:
+        prompts = json.load(f)
+    if index < 0 or index >= len(prompts):
+        print(f"ERROR: index {index} out of range (0-{len(prompts) - 1})", file=sys.stderr)
+        sys.exit(1)
+
+    entry = prompts[index]
+    title = entry.get("invented_title", "(untitled)")
+    base_tags = entry.get("tags", "")
+    print(f"Submitting: {title}")
+    print(f"  Base tags: {base_tags[:80]}...")
+    print(f"  Variations: {variations}")
+
+    tag_variations = build_tag_variations(base_tags, variations)
+
+    session = load_session()
+    timings = PhaseTimings()
+
+    from suno_browser import daemon_available, submit_variations_via_daemon, submit_via_daemon
+    if daemon_available() and not args.reload_each:
+        # Warm page in the suno-browser service: all variations in one single-pass job
+        print(f"\nSubmitting via suno-browser service...")
+        try:
+            with timings.phase("service_submit"):
+                results = submit_variations_via_daemon(entry, tag_variations)
+        except Exception as e:
+            print(f"  ERROR: {e}", file=sys.stderr)
+            results = []
+        successful, new_ids = _report_variations(tag_variations, results)
+    elif daemon_available():
+        print(f"\nSubmitting via suno-browser service...")
+        successful, new_ids = 0, set()
+        for i, var_tags in enumerate(tag_variations):
+            label = f"V{i + 1}"
+            print(f"\n  --- {label}: {var_tags[:70]}... ---")
+            try:
+                with timings.phase("service_submit"):
+                    ids = submit_via_daemon({**entry, "tags": var_tags})
+            except Exception as e:
+                print(f"  ERROR: {e}", file=sys.stderr)
+                continue
+            successful += 1
+            new_ids.update(ids)
+            print(f"  {label}: {', '.join(ids)}")
+    else:
+        successful, new_ids = _submit_in_browser(entry, tag_variations, session, timings,
+                                                 reload_each=args.reload_each)
 
     print(f"\n{'=' * 60}")
     print(f"  Submitted: {successful}/{len(tag_variations)} variations")
     print(f"  New clips: {len(new_ids)}")
     for cid in sorted(new_ids):
         print(f"    {cid}")
+    if timings:
+        print(f"  Phase timings:")
+        print(timings.format())
     print(f"{'=' * 60}")
 
+    if args.ids_file:
+        with open(args.ids_file, "w") as f:
+            json.dump(sorted(new_ids), f)
+
     if new_ids and not args.no_download:
-        print(f"\nPolling {len(new_ids)} clip(s)...")
-        clips = wait_for_completion(session, jwt, list(new_ids))
-        # Re-run download with the real base tags restored
+        # cmd_download polls and fetches each clip as soon as it finishes
         args_dl = argparse.Namespace(clip_ids=list(new_ids))
         cmd_download(args_dl)
 
 
+def parse_indexes(spec: str | None, count: int) -> list[int]:
+    """Parse "0,2,5-7" into unique prompt indexes, in first-seen order (None or "all" = every entry).
+
+    Raises ValueError for malformed parts and reversed ranges like "5-3".
+    """
+    if not spec or spec == "all":
+        return list(range(count))
+    indexes = []
+    for part in spec.split(","):
+        lo, _, hi = part.strip().partition("-")
+        lo, hi = int(lo), int(hi or lo)
+        if hi < lo:
+            raise ValueError(f"reversed range {part.strip()!r}")
+        indexes.extend(range(lo, hi + 1))
+    return list(dict.fromkeys(indexes))
+
+
+def cmd_queue(args):
+    """Submit variations for many prompt entries, keeping Suno's generation slots full."""
+    from suno_browser import daemon_available, submit_prompt, submit_via_daemon
+    from suno_queue import MAX_IN_FLIGHT, SubmissionQueue
+
+    with open(PROMPTS_FILE) as f:
+        prompts = json.load(f)
+    try:
+        indexes = parse_indexes(args.indexes, len(prompts))
+    except ValueError:
+        print(f"ERROR: bad --indexes {args.indexes!r} (expected e.g. 0,2,5-7)", file=sys.stderr)
+        sys.exit(1)
+    bad = [i for i in indexes if i < 0 or i >= len(prompts)]
+    if bad:
+        print(f"ERROR: index {bad[0]} out of range (0-{len(prompts) - 1})", file=sys.stderr)
+        sys.exit(1)
+
+    session = load_session()
+    jwt = JWTManager(session)
+    timings = PhaseTimings()
+
+    budget = args.budget
+    credits_left = credits_remaining(get_billing_info(session, jwt))
+    if credits_left is not None:
+        budget = credits_left if budget is None else min(budget, credits_left)
+    print(f"Credits remaining: {credits_left if credits_left is not None else '?'}"
+          f"  Budget: {budget if budget is not None else 'unlimited'}")
+
+    use_daemon = daemon_available()
+    if use_daemon:
+        print("Submitting via suno-browser service")
+
+        def submit(prompt):
+            with timings.phase("service_submit"):
+                return submit_via_daemon(prompt)
+    else:
+        _open_suno_page(session, timings)
+
+        def submit(prompt):
+            return submit_prompt(prompt, pw, timings=timings)
+
+    queue = SubmissionQueue(submit, lambda ids: poll_clips(session, jwt, ids),
+                            max_in_flight=args.max_in_flight or MAX_IN_FLIGHT, budget=budget)
+    for i in indexes:
+        entry = prompts[i]
+        for v, var_tags in enumerate(build_tag_variations(entry.get("tags", ""), args.variations)):
+            queue.add({**entry, "tags": var_tags}, key=f"{i}/V{v + 1}")
+    print(f"Queued {len(queue.jobs)} submission(s) from {len(indexes)} entr{'y' if len(indexes) == 1 else 'ies'}, "
+          f"up to {queue.max_in_flight} clips in flight\n")
+
+    try:
+        jobs = queue.run()
+    finally:
+        if not use_daemon:
+            pw("close")
+            print("  Browser closed")
+
+    finished = [clip["id"] for job in jobs for clip in job["clips"] if clip.get("status") == "complete"]
+    print(f"\n{'=' * 60}")
+    for status in ("done", "failed", "skipped"):
+        count = sum(1 for job in jobs if job["status"] == status)
+        if count:
+            print(f"  {status.capitalize()}: {count}")
+    print(f"  Credits spent: ~{queue.spent}")
+    print(f"  Completed clips: {len(finished)}")
+    if timings:
+        print(f"  Phase timings:")
+        print(timings.format())
+    print(f"{'=' * 60}")
+
+    if finished and not args.no_download:
+        cmd_download(argparse.Namespace(clip_ids=finished))
+
+
 # ---------------------------------------------------------------------------
 # Pick winner
 # ---------------------------------------------------------------------------
@@ -535,10 +935,14 @@ def cmd_pick(args):
     safe_title = sanitize_filename(title)
     source_id = entry.get("source_track_id", "")
 
-    # Find WIP candidates
+    # Find WIP candidates: scan WIP_DIR and add downloads the clip store knows about
+    # elsewhere (files downloaded outside `suno download` are only found by the scan)
     import glob as _glob
     wip_pattern = os.path.join(OUTPUT_DIR, "**", f"*{safe_title}__*.m4a")
-    candidates = sorted(_glob.glob(wip_pattern, recursive=True))
+    candidates = set(_glob.glob(wip_pattern, recursive=True))
+    candidates.update(c["local_path"] for c in ClipStore().by_title(title)
+                      if c.get("local_path") and os.path.exists(c["local_path"]))
+    candidates = sorted(candidates)
     if not candidates:
         print(f"ERROR: no WIP candidates found for '{title}'", file=sys.stderr)
         sys.exit(1)
@@ -553,36 +957,53 @@ def cmd_pick(args):
     else:
         # Auto-pick via Gemini eval
         try:
-            from gemini_audio import evaluate_track
+            from gemini_audio import evaluate_candidates, evaluate_tracks
         except ImportError:
             sys.path.insert(0, str(_BASE_DIR / "lib"))
-            from gemini_audio import evaluate_track
+            from gemini_audio import evaluate_candidates, evaluate_tracks
 
         tags = entry.get("tags", "")
         is_inst = entry.get("make_instrumental", False)
+        mood = tags.split(",")[-2].strip() if "," in tags else ""
 
         print(f"Evaluating {len(candidates)} candidates for '{title}'...")
         best_score = -1
         best_art = -1
         winner_m4a = None
 
-        for path in candidates:
+        if args.compare:
+            # One request ranks all candidates on a shared scale (per-clip fallback if too long)
+            comparison = evaluate_candidates(candidates, tags=tags, mood=mood, title=title,
+                                             is_instrumental=is_inst, refresh=args.refresh)
+            results = [comparison["results"].get(str(Path(p).resolve()), RuntimeError("not scored"))
+                       for p in candidates]
+            if comparison["mode"] == "comparative":
+                print(f"  Compared in one request: {comparison.get('rationale', '')}")
+        else:
+            # Evaluate concurrently; results come back in candidate order so ties break as before
+            results = evaluate_tracks([
+                {"audio_path": path, "tags": tags, "mood": mood, "title": title,
+                 "is_instrumental": is_inst, "refresh": args.refresh}
+                for path in candidates
+            ])
+        for path, result in zip(candidates, results):
             cid = os.path.basename(path).split("__")[1].replace(".m4a", "")
-            try:
-                result = evaluate_track(
-                    path, tags=tags, mood=tags.split(",")[-2].strip() if "," in tags else "",
-                    title=title, is_instrumental=is_inst,
-                )
-                score = result.get("overall_score", 0)
-                art = result.get("artistic_interest", 0)
-                verdict = result.get("verdict", "?")
-                print(f"  {cid}: {score}/5 ({verdict})")
-                if score > best_score or (score == best_score and art > best_art):
-                    best_score = score
-                    best_art = art
-                    winner_m4a = path
-            except Exception as e:
-                print(f"  {cid}: ERROR ({e})")
+            if isinstance(result, Exception):
+                print(f"  {cid}: ERROR ({result})")
+                continue
+            score = result.get("overall_score", 0)
+            art = result.get("artistic_interest", 0)
+            verdict = result.get("verdict", "?")
+            print(f"  {cid}: {score}/5 ({verdict})")
+            if score > best_score or (score == best_score and art > best_art):
+                best_score = score
+                best_art = art
+                winner_m4a = path
+
+        if args.compare and comparison["winner"]:
+            # The model's explicit ranking breaks ties the scores can't
+            winner_m4a = next(p for p in candidates if str(Path(p).resolve()) == comparison["winner"])
+            best_score = comparison["results"][comparison["winner"]].get("overall_score", best_score)
 
         if not winner_m4a:
             print("ERROR: no clips could be evaluated", file=sys.stderr)
@@ -660,6 +1081,16 @@ def build_parser() -> argparse.ArgumentParser:
     p_dl.add_argument("clip_ids", nargs="+", metavar="clip_id")
     p_dl.set_defaults(func=cmd_download)
 
+    # transcode
+    p_tc = sub.add_parser("transcode", help="Retro-transcode .m4a files to .mp3 (skips up-to-date MP3s)")
+    p_tc.add_argument("directory", nargs="?", default=None,
+                      help="Directory to scan (default: WIP_DIR)")
+    p_tc.add_argument("--no-recursive", action="store_true", help="Only scan the top directory")
+    p_tc.add_argument("--force", action="store_true", help="Re-transcode even if the MP3 is newer")
+    p_tc.add_argument("--workers", type=int, default=None,
+                      help="Parallel ffmpeg processes (default: CPU count)")
+    p_tc.set_defaults(func=cmd_transcode)
+
     # submit
     p_sub = sub.add_parser("submit", help="Submit prompts via browser (3 tag variations)")
     p_sub.add_argument("--index", type=int, default=0,
@@ -668,14 +1099,36 @@ def build_parser() -> argparse.ArgumentParser:
                         help="Number of tag variations (default: 3)")
     p_sub.add_argument("--no-download", action="store_true",
                         help="Skip polling and downloading after submission")
+    p_sub.add_argument("--reload-each", action="store_true",
+                        help="Reload and refill the whole form per variation instead of one Styles-only pass")
+    p_sub.add_argument("--ids-file", default=None,
+                        help="Write the new clip IDs to this file as a JSON list")
     p_sub.set_defaults(func=cmd_submit)
 
+    # queue
+    p_queue = sub.add_parser("queue", help="Submit variations for many prompts, keeping generation slots full")
+    p_queue.add_argument("--indexes", default=None,
+                         help="Prompt indexes in prompts_data.json, e.g. 0,2,5-7 (default: all)")
+    p_queue.add_argument("--variations", type=int, default=3, choices=[1, 2, 3],
+                         help="Tag variations per prompt (default: 3)")
+    p_queue.add_argument("--budget", type=int, default=None,
+                         help="Max credits to spend (always capped at the remaining balance)")
+    p_queue.add_argument("--max-in-flight", type=int, default=None,
+                         help="Max clips generating at once (default: SUNO_MAX_IN_FLIGHT or 10)")
+    p_queue.add_argument("--no-download", action="store_true",
+                         help="Skip downloading completed clips")
+    p_queue.set_defaults(func=cmd_queue)
+
     # pick
     p_pick = sub.add_parser("pick", help="Pick best clip, copy to OUT_DIR, update tracking")
     p_pick.add_argument("--index", type=int, default=0,
                          help="Prompt index in prompts_data.json (default: 0)")
     p_pick.add_argument("--clip-id", type=str, default=None,
                          help="Force a specific clip ID prefix (skip eval)")
+    p_pick.add_argument("--refresh", action="store_true",
+                         help="Ignore cached Gemini evaluations and re-evaluate")
+    p_pick.add_argument("--compare", action="store_true",
+                         help="Rank all candidates together in one Gemini request")
     p_pick.set_defaults(func=cmd_pick)
 
     return parser
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+suno_browser.py — Long-lived Suno browser service for form submissions.
+
+Opens the persistent playwright-cli browser once, injects the Suno session
+cookies and installs the generate-response clip-ID capture, then serves
+submission jobs over localhost HTTP. Each job is one run-code call that reloads,
+fills every field and clicks Create, waiting on page signals (form visible,
+Create enabled, generate response) rather than fixed sleeps. Without the
+service, each submission pays for a browser launch and cookie injection.
+Jobs from any number of tracks queue on one lock and run one at a time against
+the same warm page. suno submit and bin/suno-generate use the service
+automatically when it is reachable at SUNO_BROWSER_URL.
+
+Usage (via bin/suno-browser):
+    bin/suno-browser                      # serve on 127.0.0.1:8766
+    bin/suno-browser --port 9001          # then export SUNO_BROWSER_URL=http://127.0.0.1:9001
+
+Endpoints:
+    GET  /health     {"ok": true, "submitted": n, "queued": n, "timings": {phase: stats}}
+    POST /submit     {"prompt": {...prompts_data entry...}}  -> {"ok": true, "clip_ids": [...]}
+                     {"prompt": {...}, "variations": [tags, ...]}
+                                      -> {"ok": true, "clip_ids": [...], "variations": [[...], ...]}
+    POST /close      close the browser and stop the service
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from phase_timing import PhaseTimings
+
+SUNO_BROWSER_URL = os.getenv("SUNO_BROWSER_URL", "http://127.0.0.1:8766")
+SUNO_CREATE_URL = "https://suno.com/create"
+SUBMIT_TIMEOUT = 900  # seconds a client waits for its job (queue time + a manual captcha solve)
+CAPTCHA_TIMEOUT = 300
+CAPTCHA_PATTERNS = (r"Select everything", r"hCaptcha", r"Challenge Image",
+                    r"Verify Answers", r"captcha", r"Please verify")
+
+
+def _fill_statements_js(prompt: dict) -> str:
+    """JS statements (for a run-code body with `page` in scope) that fill one prompt into the form."""
+    # Use json.dumps for safe JS string embedding (JSON strings are valid JS literals)
+    tags_js = json.dumps(prompt.get("tags", ""))
+    title_js = json.dumps(prompt.get("invented_title", ""))
+    lyrics_js = json.dumps(prompt.get("prompt", ""))
+    is_instrumental = "true" if prompt.get("make_instrumental", False) else "false"
+
+    # Build JS without f-string/template-literal conflicts — all dynamic values via json.dumps.
+    #
+    # Key findings from debugging Suno's React form:
+    # - Suno uses React components, not raw HTML inputs. getAttribute('placeholder') returns null.
+    # - Use getByRole('textbox', {name: /pattern/}) which reads the accessible name from the
+    #   accessibility tree (same names shown in playwright-cli snapshots).
+    # - fill() works for all fields when called directly via getByRole locators.
+    # - The Styles textbox has rotating placeholder text — match by exclusion (get all textboxes,
+    #   subtract lyrics/title/search/enhance/workspace).
+    # - Lyrics field: fill() works with multi-line content (tested directly).
+    return (
+        f"  const tags = {tags_js};\n"
+        f"  const title = {title_js};\n"
+        f"  const lyrics = {lyrics_js};\n"
+        f"  const isInstrumental = {is_instrumental};\n"
+        "\n"
+        "  // Lyrics — match by accessible name (from placeholder text in React component)\n"
+        "  const lyricsBox = page.getByRole('textbox', { name: /Write some|lyric/i }).first();\n"
+        "  // Title — match by accessible name\n"
+        "  const titleBox = page.getByRole('textbox', { name: /Song Title|Title \\(Optional\\)/i }).first();\n"
+        "\n"
+        "  // Styles — the placeholder text rotates, so find by exclusion.\n"
+        "  // Get the accessible name of lyrics and title boxes, then find the textbox that isn't them.\n"
+        "  const allBoxes = page.getByRole('textbox');\n"
+        "  const count = await allBoxes.count();\n"
+        "  let stylesBox = null;\n"
+        "  const lyricsName = await lyricsBox.evaluate(el => el.getAttribute('aria-label') || el.getAttribute('placeholder') || el.textContent?.substring(0, 30) || '');\n"
+        "  for (let i = 0; i < count; i++) {\n"
+        "    const box = allBoxes.nth(i);\n"
+        "    // Use evaluate to get the accessible name from the DOM\n"
+        "    const acc = await box.evaluate(el => el.getAttribute('aria-label') || el.getAttribute('placeholder') || el.accessibleName || '');\n"
+        "    const accL = acc.toLowerCase();\n"
+        "    if (accL.includes('lyric') || accL.includes('write some') || accL.includes('prompt')) continue;\n"
+        "    if (accL.includes('title')) continue;\n"
+        "    if (accL.includes('search') || accL.includes('page') || accL.includes('enhance') || accL.includes('workspace')) continue;\n"
+        "    // This must be the Styles box\n"
+        "    stylesBox = box;\n"
+        "    break;\n"
+        "  }\n"
+        "\n"
+        "  // Fill Lyrics first (fill() works with multi-line content)\n"
+        "  await lyricsBox.fill(lyrics);\n"
+        "\n"
+        "  // Title and Styles — click + select all + insertText to trigger React state reliably\n"
+        "  // (fill() works on empty fields but doesn't update React state when overwriting)\n"
+        "  const typeInto = async (box, text) => {\n"
+        "    await box.click();\n"
+        "    await page.keyboard.press('Meta+a');\n"
+        "    await page.keyboard.press('Backspace');\n"
+        "    await page.keyboard.insertText(text);\n"
+        "  };\n"
+        "  await typeInto(titleBox, title);\n"
+        "  if (stylesBox) await typeInto(stylesBox, tags);\n"
+        "\n"
+        "  // Handle Instrumental toggle\n"
+        "  const toggle = page.getByRole('button', { name: /Instrumental/i }).first();\n"
+        "  if (await toggle.count() > 0) {\n"
+        "    const pressed = await toggle.getAttribute('aria-pressed');\n"
+        "    const isOn = pressed === 'true';\n"
+        "    if (isInstrumental !== isOn) await toggle.click();\n"
+        "  }\n"
+        "\n"
+    )
+
+
+def build_fill_js(prompt: dict) -> str:
+    """run-code JS that fills Styles, Title, Lyrics and the Instrumental toggle (no Create click)."""
+    return "async page => {\n" + _fill_statements_js(prompt) + "  return 'Form filled: ' + title;\n}"
+
+
+# Generate endpoint as seen from the page (the web client posts to /api/generate/v2-web/)
+_GENERATE_URL_JS = r"/\/api\/generate\/v2(-web)?\//"
+
+
+def build_ready_js(timeout_ms: int = 30000) -> str:
+    """run-code JS that returns once the create form is interactive (textboxes + Create button visible)."""
+    return (
+        "async page => {\n"
+        "  const t0 = Date.now();\n"
+        f"  await page.getByRole('textbox').first().waitFor({{ state: 'visible', timeout: {timeout_ms} }});\n"
+        f"  await page.getByRole('button', {{ name: 'Create song' }}).waitFor({{ state: 'visible', timeout: {timeout_ms} }});\n"
+        "  return 'READY=' + (Date.now() - t0) / 1000;\n"
+        "}"
+    )
+
+
+def _submit_prelude_js(reload: bool, timeout_ms: int, generate_timeout_ms: int) -> str:
+    """Shared start of the submit scripts: phase clock, reload, form readiness and a Create helper."""
+    return (
+        "  const t = [];\n"
+        "  let t0 = Date.now();\n"
+        "  const mark = name => { const now = Date.now(); t.push([name, (now - t0) / 1000]); t0 = now; };\n"
+        + ("  await page.reload({ waitUntil: 'domcontentloaded' });\n  mark('reload');\n" if reload else "")
+        + "  const create = page.getByRole('button', { name: 'Create song' });\n"
+        f"  await page.getByRole('textbox').first().waitFor({{ state: 'visible', timeout: {timeout_ms} }});\n"
+        f"  await create.waitFor({{ state: 'visible', timeout: {timeout_ms} }});\n"
+        "  const titleField = page.getByRole('textbox', { name: /Song Title|Title \\(Optional\\)/i });\n"
+        "  if (await titleField.count() === 0) {\n"
+        "    await page.getByRole('button', { name: 'Custom', exact: true }).first().click();\n"
+        f"    await titleField.first().waitFor({{ state: 'visible', timeout: {timeout_ms} }});\n"
+        "  }\n"
+        "  mark('form_ready');\n"
+        "\n"
+        "  // Wait for Create to enable (React state caught up), click it, return the clip IDs\n"
+        "  // from the generate response ([] on timeout, e.g. while a captcha is pending)\n"
+        "  const createHandle = await create.elementHandle();\n"
+        "  const clickCreate = async () => {\n"
+        "    await page.waitForFunction(el => !el.disabled && el.getAttribute('aria-disabled') !== 'true',\n"
+        f"                                createHandle, {{ timeout: {timeout_ms} }});\n"
+        "    mark('create_enabled');\n"
+        "    if (page.__refraktClipIds) page.__refraktClipIds.splice(0);  // listener keeps only this click's IDs\n"
+        "    const generated = page.waitForResponse(\n"
+        f"      r => r.request().method() === 'POST' && {_GENERATE_URL_JS}.test(r.url()),\n"
+        f"      {{ timeout: {generate_timeout_ms} }});\n"
+        "    await create.click();\n"
+        "    let ids = [];\n"
+        "    try {\n"
+        "      const body = await (await generated).json();\n"
+        "      ids = (body.clips || []).map(c => c.id).filter(Boolean);\n"
+        "    } catch (e) {}\n"
+        "    mark('generate');\n"
+        "    return ids;\n"
+        "  };\n"
+        "\n"
+    )
+
+
+def build_submit_js(prompt: dict, reload: bool = True, timeout_ms: int = 30000,
+                    generate_timeout_ms: int = 20000) -> str:
+    """run-code JS for one whole submission, waiting on readiness signals instead of sleeps.
+
+    Phases (each timed, returned as SUBMIT_RESULT={"ids": [...], "t": [[phase, seconds], ...]}):
+        reload            page.reload() to DOMContentLoaded (clears React form state)
+        form_ready        a textbox and the Create button are visible (Custom mode switched on)
+        fill              every field written
+        create_enabled    the Create button reports enabled (React state caught up)
+        generate          the POST to the generate endpoint answered (ids empty on timeout,
+                          e.g. when a captcha is pending; the page listener still records it)
+    """
+    return (
+        "async page => {\n"
+        + _submit_prelude_js(reload, timeout_ms, generate_timeout_ms)
+        + _fill_statements_js(prompt)
+        + "  mark('fill');\n"
+        "  const ids = await clickCreate();\n"
+        "  return 'SUBMIT_RESULT=' + JSON.stringify({ ids, t });\n"
+        "}"
+    )
+
+
+def build_batch_submit_js(prompt: dict, tag_variations: list[str], reload: bool = True,
+                          timeout_ms: int = 30000, generate_timeout_ms: int = 20000) -> str:
+    """run-code JS that submits several Styles variations of one prompt in a single pass.
+
+    The form is located and filled once (with the first variation's tags);
+    each later variation only overwrites the Styles box before clicking Create
+    again, with no reload in between. Stops at the first variation whose
+    generate response does not arrive, so the caller can handle a captcha and
+    resume. Returns SUBMIT_RESULT={"ids": [[...] per attempted variation], "t": [...]}
+    with the extra per-variation phase `styles`.
+    """
+    return (
+        "async page => {\n"
+        + _submit_prelude_js(reload, timeout_ms, generate_timeout_ms)
+        + _fill_statements_js({**prompt, "tags": tag_variations[0]})
+        + "  mark('fill');\n"
+        "  if (!stylesBox) throw new Error('Could not find Styles textbox');\n"
+        f"  const variations = {json.dumps(list(tag_variations))};\n"
+        "  const ids = [];\n"
+        "  for (let i = 0; i < variations.length; i++) {\n"
+        "    if (i > 0) {\n"
+        "      await typeInto(stylesBox, variations[i]);\n"
+        "      mark('styles');\n"
+        "    }\n"
+        "    const got = await clickCreate();\n"
+        "    ids.push(got);\n"
+        "    if (!got.length) break;\n"
+        "  }\n"
+        "  return 'SUBMIT_RESULT=' + JSON.stringify({ ids, t });\n"
+        "}"
+    )
+
+
+def _parse_submit_result(output: str) -> dict:
+    m = re.search(r"SUBMIT_RESULT=(\{.*\})", output)
+    if not m:
+        raise RuntimeError(f"submission script failed: {output.strip()[:200]}")
+    return json.loads(m.group(1))
+
+
+def wait_until_ready(pw_fn, timeout: float = 30) -> float:
+    """Block until the create form is interactive. Returns the seconds waited."""
+    output = pw_fn("run-code", build_ready_js(int(timeout * 1000)), timeout=int(timeout) + 15)
+    m = re.search(r"READY=([\d.]+)", output)
+    if not m:
+        raise RuntimeError(f"Suno create page never became ready: {output.strip()[:200]}")
+    return float(m.group(1))
+
+
+def captcha_visible(pw_fn) -> bool:
+    snapshot = pw_fn("snapshot")
+    return any(re.search(p, snapshot, re.IGNORECASE) for p in CAPTCHA_PATTERNS)
+
+
+def _await_stalled_ids(pw_fn, phases: list, captcha_timeout: float) -> list[str]:
+    """IDs for a Create click whose generate response timed out, waiting out a captcha if one is up.
+
+    Reads them from the page listener (install_clip_capture must have run on this page).
+    """
+    from suno import CLIPS_PER_SUBMISSION, collect_captured_clip_ids
+    if not captcha_visible(pw_fn):
+        return collect_captured_clip_ids(expected=CLIPS_PER_SUBMISSION, pw_fn=pw_fn)
+    print("  CAPTCHA — solve it in the browser window", flush=True)
+    t0 = time.monotonic()
+    clip_ids = collect_captured_clip_ids(expected=CLIPS_PER_SUBMISSION, timeout=captcha_timeout, pw_fn=pw_fn)
+    phases.append(["captcha", time.monotonic() - t0])
+    return clip_ids
+
+
+def submit_prompt(prompt: dict, pw_fn, timings=None, reload: bool = True,
+                  captcha_timeout: float = CAPTCHA_TIMEOUT) -> list[str]:
+    """Fill and create one prompt on the open page. Returns its clip IDs.
+
+    One run-code call does the whole submission (see build_submit_js). When
+    the generate response does not arrive in time, a captcha is usually up:
+    wait for the user to solve it and read the IDs from the page listener.
+    Phase durations go into timings (a PhaseTimings) when given.
+    """
+    t0 = time.monotonic()
+    result = _parse_submit_result(pw_fn("run-code", build_submit_js(prompt, reload=reload), timeout=120))
+    clip_ids = result["ids"] or _await_stalled_ids(pw_fn, result["t"], captcha_timeout)
+    if timings is not None:
+        timings.update(result["t"])
+        timings.record("total", time.monotonic() - t0)
+    if not clip_ids:
+        raise RuntimeError("no generate response captured")
+    return clip_ids
+
+
+def submit_variations(prompt: dict, tag_variations: list[str], pw_fn, timings=None, reload: bool = True,
+                      captcha_timeout: float = CAPTCHA_TIMEOUT) -> list[list[str]]:
+    """Submit every Styles variation of one prompt in a single pass (see build_batch_submit_js).
+
+    Returns the clip IDs per variation, in order ([] for a variation whose
+    Create produced nothing). After a stalled variation (captcha) the pass
+    resumes on the same page without reloading.
+    """
+    results = []
+    while len(results) < len(tag_variations):
+        remaining = tag_variations[len(results):]
+        t0 = time.monotonic()
+        js = build_batch_submit_js(prompt, remaining, reload=reload and not results)
+        result = _parse_submit_result(pw_fn("run-code", js, timeout=60 + 60 * len(remaining)))
+        results.extend(result["ids"])
+        if not results[-1]:
+            results[-1] = _await_stalled_ids(pw_fn, result["t"], captcha_timeout)
+        if timings is not None:
+            timings.update(result["t"])
+            timings.record("batch", time.monotonic() - t0)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+class SunoBrowser:
+    """One warm, authenticated Suno create page driven through playwright-cli."""
+
+    def __init__(self):
+        from suno import PROFILE_DIR, install_clip_capture, load_session, pw
+        self._pw = pw
+        self.profile_dir = PROFILE_DIR
+        self.load_session = load_session
+        self.install_clip_capture = install_clip_capture
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.queued = 0
+        self.timings = PhaseTimings()
+
+    def start(self):
+        pw = self._pw
+        session = self.load_session()
+        with self.timings.phase("open"):
+            pw("open", "--headed", "--persistent", f"--profile={self.profile_dir}", SUNO_CREATE_URL, timeout=60)
+            for name, value in (("__client", session["client_token"]),
+                                ("sessionid", session["django_session_id"])):
+                pw("cookie-set", name, value, "--domain=.suno.com", "--path=/", "--secure", "--httpOnly")
+            pw("goto", SUNO_CREATE_URL)
+            wait_until_ready(pw)
+        if not self.install_clip_capture():
+            raise RuntimeError("could not install clip-ID capture on the Suno page")
+
+    def close(self):
+        self._pw("close")
+
+    def submit(self, prompt: dict) -> list[str]:
+        """Fill and create one prompt on the warm page (jobs run one at a time). Returns its clip IDs."""
+        self.queued += 1
+        try:
+            with self.lock:
+                clip_ids = submit_prompt(prompt, self._pw, timings=self.timings)
+                self.submitted += 1
+                return clip_ids
+        finally:
+            self.queued -= 1
+
+    def submit_variations(self, prompt: dict, tag_variations: list[str]) -> list[list[str]]:
+        """Submit every Styles variation of one prompt in a single pass. Returns clip IDs per variation."""
+        self.queued += 1
+        try:
+            with self.lock:
+                results = submit_variations(prompt, tag_variations, self._pw, timings=self.timings)
+                self.submitted += sum(1 for ids in results if ids)
+                return results
+        finally:
+            self.queued -= 1
+
+
+class BrowserHandler(BaseHTTPRequestHandler):
+    """Threaded so /health answers while a submission runs; SunoBrowser.lock serializes the page."""
+
+    browser: SunoBrowser = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"ok": True, "submitted": self.browser.submitted,
+                                  "queued": self.browser.queued,
+                                  "timings": self.browser.timings.summary()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/submit":
+                prompt = payload.get("prompt") or {}
+                variations = payload.get("variations")
+                t0 = time.time()
+                if variations:
+                    results = self.browser.submit_variations(prompt, variations)
+                    clip_ids = [i for ids in results for i in ids]
+                    body = {"ok": True, "clip_ids": clip_ids, "variations": results}
+                else:
+                    clip_ids = self.browser.submit(prompt)
+                    body = {"ok": True, "clip_ids": clip_ids}
+                print(f"  {prompt.get('invented_title', '?')}: {', '.join(clip_ids)} "
+                      f"in {time.time() - t0:.1f}s", flush=True)
+                self._send_json(200, body)
+            elif self.path == "/close":
+                self._send_json(200, {"ok": True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                self._send_json(404, {"error": "not found"})
+        except Exception as e:
+            print(f"  {self.path}: ERROR {e}", flush=True)
+            self._send_json(500, {"ok": False, "error": str(e)})
+
+    def log_message(self, format, *args):
+        pass  # per-job timing is printed above instead
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+_daemon_available = None
+
+
+def daemon_available() -> bool:
+    """True if a suno-browser service answers at SUNO_BROWSER_URL (checked once per process)."""
+    global _daemon_available
+    if _daemon_available is None:
+        try:
+            with urllib.request.urlopen(f"{SUNO_BROWSER_URL}/health", timeout=2) as r:
+                _daemon_available = bool(json.load(r).get("ok"))
+        except (OSError, ValueError):
+            _daemon_available = False
+    return _daemon_available
+
+
+def _post_submit(payload: dict, timeout: float) -> dict:
+    request = urllib.request.Request(
+        f"{SUNO_BROWSER_URL}/submit",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as r:
+            body = json.load(r)
+    except urllib.error.HTTPError as e:
+        body = json.loads(e.read() or b"{}")
+    if not body.get("ok"):
+        raise RuntimeError(f"suno-browser submit failed: {body.get('error', 'unknown error')}")
+    return body
+
+
+def submit_via_daemon(prompt: dict, timeout: float = SUBMIT_TIMEOUT) -> list[str]:
+    """Queue one submission on the running service and wait for its clip IDs."""
+    return _post_submit({"prompt": prompt}, timeout)["clip_ids"]
+
+
+def submit_variations_via_daemon(prompt: dict, tag_variations: list[str],
+                                 timeout: float = SUBMIT_TIMEOUT) -> list[list[str]]:
+    """Queue a single-pass multi-variation submission on the service. Returns clip IDs per variation."""
+    return _post_submit({"prompt": prompt, "variations": tag_variations}, timeout)["variations"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep a warm Suno page and serve submissions over localhost")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8766, help="Port (default: 8766)")
+    args = parser.parse_args()
+
+    browser = SunoBrowser()
+    print("Opening Suno browser...")
+    t0 = time.time()
+    browser.start()
+    print(f"  Ready in {time.time() - t0:.1f}s")
+
+    BrowserHandler.browser = browser
+    server = ThreadingHTTPServer((args.host, args.port), BrowserHandler)
+    print(f"Suno browser service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+        browser.close()
+        print("Browser closed.")
+        if browser.timings:
+            print("\nPhase timings:")
+            print(browser.timings.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+suno_queue.py — Cross-track Suno submission scheduler.
+
+Suno renders several generations at once, but submitting prompts one after
+another and then waiting for all of them leaves those slots idle. A
+SubmissionQueue takes any number of prompt entries (one job per tag
+variation), keeps up to max_in_flight clips generating, and polls the
+in-flight clips so the next job is submitted as soon as enough clips
+finish to free a slot.
+
+Each Create spends credits. The queue stops submitting once the next job
+would exceed the budget. The caller usually caps the budget at
+credits_remaining(get_billing_info(...)). Jobs it could not afford are
+reported as "skipped".
+
+Submission itself stays serial: submit(prompt) drives the one browser page,
+through the suno-browser service or a locally opened browser. The queue only
+decides when the next call happens.
+
+Usage:
+    from suno_queue import SubmissionQueue
+
+    queue = SubmissionQueue(submit=lambda p: submit_via_daemon(p),
+                            poll=lambda ids: poll_clips(session, jwt, ids),
+                            max_in_flight=6, budget=120)
+    queue.add({**entry, "tags": tags}, key="0/V1")
+    jobs = queue.run()   # [{"key", "prompt", "status", "clip_ids", "clips", "error"}, ...]
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from clip_store import FINAL_STATUSES
+from suno import CLIPS_PER_SUBMISSION, POLL_BACKOFF, POLL_INITIAL_INTERVAL, POLL_MAX_INTERVAL
+
+MAX_IN_FLIGHT = int(os.getenv("SUNO_MAX_IN_FLIGHT", "10"))  # clips generating at once
+CREDITS_PER_SUBMISSION = 10  # one Create (a pair of clips)
+CLIP_TIMEOUT = 600  # seconds before an unfinished clip stops holding a slot
+
+
+class SubmissionQueue:
+    """Submit queued prompts whenever a generation slot is free, within a credit budget."""
+
+    def __init__(self, submit, poll, max_in_flight: int = MAX_IN_FLIGHT, budget: int | None = None,
+                 on_finished=None, credits_per_submission: int = CREDITS_PER_SUBMISSION,
+                 clip_timeout: float = CLIP_TIMEOUT):
+        self.submit = submit
+        self.poll = poll
+        # A submission adds a whole pair, so at least one must fit or nothing would ever run
+        self.max_in_flight = max(max_in_flight, CLIPS_PER_SUBMISSION)
+        self.budget = budget
+        self.on_finished = on_finished
+        self.credits_per_submission = credits_per_submission
+        self.clip_timeout = clip_timeout
+        self.jobs = []
+        self.spent = 0
+
+    def add(self, prompt: dict, key: str | None = None) -> dict:
+        job = {"key": key or str(len(self.jobs)), "prompt": prompt, "status": "queued",
+               "clip_ids": [], "clips": [], "error": None}
+        self.jobs.append(job)
+        return job
+
+    def _affordable(self) -> bool:
+        return self.budget is None or self.spent + self.credits_per_submission <= self.budget
+
+    def _submit_next(self, job: dict, in_flight: dict) -> None:
+        title = job["prompt"].get("invented_title", "?")
+        print(f"  [{job['key']}] Submitting {title} ({len(in_flight)} clip(s) in flight)", flush=True)
+        # Count the credits up front: a submit that fails after Create was clicked
+        # (e.g. clip IDs never captured) has still been charged
+        self.spent += self.credits_per_submission
+        try:
+            clip_ids = self.submit(job["prompt"])
+        except Exception as e:
+            job["status"], job["error"] = "failed", str(e)
+            print(f"  [{job['key']}] ERROR: {e}", file=sys.stderr, flush=True)
+            return
+        if not clip_ids:
+            job["status"], job["error"] = "failed", "no clip IDs returned"
+            return
+        job["status"], job["clip_ids"] = "generating", list(clip_ids)
+        now = time.time()
+        for clip_id in clip_ids:
+            in_flight[clip_id] = (job, now)
+        print(f"  [{job['key']}] {', '.join(clip_ids)}", flush=True)
+
+    def _collect_finished(self, in_flight: dict) -> bool:
+        """Poll the in-flight clips once. Returns True if any slot was freed."""
+        try:
+            clips = self.poll(list(in_flight))
+        except Exception as e:
+            print(f"  WARN: poll failed: {e}", file=sys.stderr, flush=True)
+            return False
+        freed = False
+        for clip in clips:
+            if clip.get("id") in in_flight and clip.get("status") in FINAL_STATUSES:
+                job, _ = in_flight.pop(clip["id"])
+                job["clips"].append(clip)
+                freed = True
+                print(f"  [{job['key']}] {clip['id'][:8]} {clip['status']}", flush=True)
+                if self.on_finished:
+                    self.on_finished(clip)
+        deadline = time.time() - self.clip_timeout
+        for clip_id, (job, submitted_at) in list(in_flight.items()):
+            if submitted_at < deadline:
+                del in_flight[clip_id]
+                job["error"] = f"{clip_id} timed out"
+                freed = True
+                print(f"  [{job['key']}] {clip_id[:8]} timed out after {self.clip_timeout:.0f}s",
+                      file=sys.stderr, flush=True)
+        for job in self.jobs:
+            if job["status"] == "generating" and not any(j is job for j, _ in in_flight.values()):
+                job["status"] = "done"
+        return freed
+
+    def run(self) -> list[dict]:
+        """Submit and poll until every job is done, failed or skipped. Returns the job dicts."""
+        pending = deque(self.jobs)
+        in_flight = {}  # clip_id -> (job, submitted_at)
+        interval = POLL_INITIAL_INTERVAL
+        while pending or in_flight:
+            while pending and len(in_flight) + CLIPS_PER_SUBMISSION <= self.max_in_flight:
+                if not self._affordable():
+                    print(f"  Credit budget reached ({self.spent}/{self.budget}); "
+                          f"skipping {len(pending)} job(s)", flush=True)
+                    for job in pending:
+                        job["status"] = "skipped"
+                    pending.clear()
+                    break
+                self._submit_next(pending.popleft(), in_flight)
+            if not in_flight:
+                continue
+            time.sleep(interval)
+            if self._collect_finished(in_flight):
+                interval = POLL_INITIAL_INTERVAL
+            else:
+                interval = min(interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+        return self.jobs
@@ -18,7 +18,6 @@ import re
 import sys
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 from mutagen.mp4 import MP4, MP4Cover
 
@@ -35,6 +34,13 @@ CDN_BASE = "https://cdn1.suno.ai"
 DEFAULT_ALBUM_NAME = "Refrakt"
 ARTIST_NAME = os.getenv("ARTIST_NAME", "Refrakt")
 
+# Ensure lib/ is on sys.path so sibling module imports resolve regardless of invocation path
+_LIB_DIR = Path(__file__).parent
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+import http_client
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -54,7 +60,7 @@ def find_m4a_files(directory: Path) -> list[Path]:
 def download_cover_art(image_url: str) -> bytes | None:
     """Download JPEG cover art from Suno CDN. Returns bytes or None on failure."""
     try:
-        r = requests.get(image_url, timeout=15)
+        r = http_client.get(image_url, timeout=15)
         r.raise_for_status()
         return r.content
     except Exception as e:
@@ -143,22 +149,17 @@ def tag_file(filepath: str | Path, clip: dict, prompt: dict | None = None) -> No
 # Feed fetching (for retro-tagging)
 # ---------------------------------------------------------------------------
 
-def _fetch_all_feed_clips(max_pages: int = 10) -> list[dict]:
-    """Fetch clip data from Suno feed, up to max_pages pages."""
+def _fetch_all_feed_clips() -> list[dict]:
+    """Sync the local clip store with the Suno feed (new pages only) and return every stored clip."""
     # Lazy import to avoid circular dependency and keep suno.py optional
-    sys.path.insert(0, str(_BASE_DIR / "lib"))
-    from suno import load_session, refresh_jwt, get_feed
+    from clip_store import ClipStore
+    from suno import JWTManager, load_session, sync_feed
 
+    store = ClipStore()
     session = load_session()
-    jwt = refresh_jwt(session)
-
-    all_clips = []
-    for page in range(max_pages):
-        clips = get_feed(session, jwt, page=page)
-        if not clips:
-            break
-        all_clips.extend(clips)
-    return all_clips
+    new_ids = sync_feed(session, JWTManager(session), store)
+    print(f"  Synced {len(new_ids)} new clip(s) into the local store.")
+    return store.all()
 
 
 def _build_clip_index(clips: list[dict]) -> dict[str, dict]:
@@ -216,7 +217,7 @@ def main():
     print("Fetching clip metadata from Suno feed...")
     all_clips = _fetch_all_feed_clips()
     clip_index = _build_clip_index(all_clips)
-    print(f"  Loaded {len(all_clips)} clips from feed.\n")
+    print(f"  Loaded {len(all_clips)} clips from the clip store.\n")
 
     # Load prompts for source track info
     prompts = load_prompts()
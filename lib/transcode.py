@@ -0,0 +1,123 @@
+"""
+transcode.py — Pooled M4A → MP3 transcoding for Apple Music compatibility.
+
+A TranscodeService keeps up to one ffmpeg process per CPU busy, fed from a
+queue by whoever calls submit() (the downloader in suno.cmd_download, or
+transcode_directory for retro runs). Files whose MP3 is already newer than the
+M4A are skipped, and output is written to a temp file and renamed, so an
+interrupted run never leaves a half-written MP3 that looks up to date.
+
+Usage:
+    from transcode import TranscodeService, transcode_directory
+
+    with TranscodeService() as service:
+        mp3_path = service.submit("clip.m4a").result()   # None on failure
+
+    transcode_directory("~/Downloads", recursive=True)   # retro-transcode a tree
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+MP3_BITRATE = "320k"
+TRANSCODE_TIMEOUT = 120  # seconds per file
+
+
+def mp3_path_for(m4a_path) -> str:
+    return str(Path(m4a_path).with_suffix(".mp3"))
+
+
+def is_up_to_date(m4a_path) -> bool:
+    """True if the MP3 next to m4a_path exists, is non-empty and is newer than the M4A."""
+    try:
+        src = os.stat(m4a_path)
+        dst = os.stat(mp3_path_for(m4a_path))
+    except OSError:
+        return False
+    return dst.st_size > 0 and dst.st_mtime >= src.st_mtime
+
+
+def transcode_to_mp3(m4a_path: str, bitrate: str = MP3_BITRATE) -> str | None:
+    """Transcode .m4a (Opus) to .mp3 for Apple Music compatibility. Returns mp3 path or None."""
+    if not shutil.which("ffmpeg"):
+        return None
+    mp3_path = mp3_path_for(m4a_path)
+    tmp_path = mp3_path + ".tmp"
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-nostdin", "-i", m4a_path, "-c:a", "libmp3lame", "-b:a", bitrate,
+             "-map_metadata", "0", "-id3v2_version", "3", "-f", "mp3", "-y", tmp_path],
+            capture_output=True, text=True, timeout=TRANSCODE_TIMEOUT,
+        )
+        if result.returncode == 0 and os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
+            os.replace(tmp_path, mp3_path)
+            return mp3_path
+        print(f"  WARNING: ffmpeg exited {result.returncode}: {result.stderr[-200:]}", file=sys.stderr)
+    except subprocess.TimeoutExpired:
+        print(f"  WARNING: ffmpeg transcode timed out for {m4a_path}", file=sys.stderr)
+    except OSError as e:
+        print(f"  WARNING: ffmpeg transcode failed: {e}", file=sys.stderr)
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    return None
+
+
+class TranscodeService:
+    """Bounded pool of ffmpeg workers. submit() queues a file and returns a Future[str | None].
+
+    Workers are threads that each supervise one ffmpeg child process, so the
+    encoding itself runs in parallel processes without pickling overhead.
+    """
+
+    def __init__(self, max_workers: int | None = None, bitrate: str = MP3_BITRATE, force: bool = False):
+        self.bitrate = bitrate
+        self.force = force
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 2,
+                                       thread_name_prefix="transcode")
+
+    def submit(self, m4a_path):
+        return self.pool.submit(self._run, str(m4a_path))
+
+    def _run(self, m4a_path: str) -> str | None:
+        if not self.force and is_up_to_date(m4a_path):
+            return mp3_path_for(m4a_path)
+        return transcode_to_mp3(m4a_path, self.bitrate)
+
+    def close(self, wait: bool = True):
+        self.pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def transcode_directory(directory, recursive: bool = True, force: bool = False,
+                        max_workers: int | None = None, bitrate: str = MP3_BITRATE) -> dict:
+    """Transcode every .m4a under directory whose MP3 is missing or stale.
+
+    Returns {"transcoded": n, "skipped": n, "failed": [paths]}.
+    """
+    root = Path(os.path.expanduser(str(directory)))
+    m4as = sorted(root.rglob("*.m4a") if recursive else root.glob("*.m4a"))
+    pending = [p for p in m4as if force or not is_up_to_date(p)]
+    summary = {"transcoded": 0, "skipped": len(m4as) - len(pending), "failed": []}
+    if not pending:
+        return summary
+
+    with TranscodeService(max_workers=max_workers, bitrate=bitrate, force=force) as service:
+        futures = {service.submit(p): p for p in pending}
+        for future in as_completed(futures):
+            path = futures[future]
+            if future.result():
+                summary["transcoded"] += 1
+                print(f"  OK    {path.name}")
+            else:
+                summary["failed"].append(str(path))
+                print(f"  FAIL  {path.name}")
+    return summary
@@ -0,0 +1,38 @@
+"""Regression tests for the shared-decode AnalysisContext in lib/audio_analysis.py."""
+
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+librosa = pytest.importorskip("librosa")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+import audio_analysis  # noqa: E402
+
+
+def _write_tone(path, freqs, sr=22050, seconds=3.0):
+    t = np.arange(int(sr * seconds)) / sr
+    y = sum(np.sin(2 * np.pi * f * t) for f in freqs) / len(freqs)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes((y * 0.5 * 32767).astype(np.int16).tobytes())
+
+
+@pytest.mark.parametrize("detune", [1.0, 2 ** (30 / 1200)])  # A440 and +30 cents
+def test_shared_cqt_matches_chroma_from_signal(tmp_path, detune):
+    path = tmp_path / "tone.wav"
+    _write_tone(path, [220.0 * detune, 277.18 * detune, 329.63 * detune])
+    ctx = audio_analysis.AnalysisContext(path, use_cache=False)
+
+    expected_cqt = librosa.feature.chroma_cqt(y=ctx.y, sr=ctx.sr)
+    expected_cens = librosa.feature.chroma_cens(y=ctx.y, sr=ctx.sr)
+
+    np.testing.assert_allclose(librosa.feature.chroma_cqt(C=ctx.cqt, sr=ctx.sr), expected_cqt,
+                               rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(librosa.feature.chroma_cens(C=ctx.cqt, sr=ctx.sr), expected_cens,
+                               rtol=1e-5, atol=1e-6)